@@ -0,0 +1,277 @@
+"""Load test concurrent task changes against the Kids Schedule coordinator.
+
+Run from the repository root (Home Assistant must be installed):
+
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --taps 100,1000 --refreshes 10 --json out.json
+    python -m benchmarks.bench_concurrency --save-delay 0.5
+
+Each scenario fires a burst of taps, as if many tablets checked and unchecked
+tasks at the same moment, spread over a few milliseconds so they arrive in
+several batches. Calendar refreshes run in between. A tap returns once its
+change is applied and published; the burst is written to storage once it
+has been quiet for the save delay, which the benchmark waits for (pass a
+shorter --save-delay for quick runs). It then compares every task, in
+memory and in the saved state, with the last tap aimed at it: any
+difference is a lost update. Like the pipeline
+benchmark, it runs against a real, unstarted Home Assistant core with a
+local stand-in for calendar.get_events.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import itertools
+import json
+import logging
+from pathlib import Path
+import platform
+import random
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.util import dt as dt_util
+
+from custom_components.kids_schedule import coordinator as coordinator_module
+from custom_components.kids_schedule.const import (
+    DOMAIN,
+    SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.kids_schedule.coordinator import KidsScheduleCoordinator
+from custom_components.kids_schedule.storage import KidsScheduleStore
+
+from .bench_pipeline import CALENDAR_ENTITY, MANIFEST, _int_list
+
+# One routine per hour from 08:00, so they never overlap
+FIRST_HOUR = 8
+
+
+def _make_calendar(routines: int, tasks: int) -> list[dict[str, Any]]:
+    """Return today's events, each with its own list of tasks."""
+    start_of_day = dt_util.start_of_local_day()
+    events = []
+    for index in range(routines):
+        start = start_of_day + timedelta(hours=FIRST_HOUR + index)
+        events.append(
+            {
+                "summary": f"Routine {index}",
+                "start": start.isoformat(),
+                "end": (start + timedelta(hours=1)).isoformat(),
+                "description": "\n".join(
+                    f"- Task {index}.{task}" for task in range(tasks)
+                ),
+            }
+        )
+    return events
+
+
+async def run_scenario(
+    config_dir: str,
+    *,
+    taps: int,
+    routines: int,
+    tasks: int,
+    refreshes: int,
+    spread_ms: float,
+    save_delay: float,
+    seed: int,
+) -> dict[str, float]:
+    """Fire a burst of taps and check that none was lost."""
+    hass = HomeAssistant(config_dir)
+    calendar = _make_calendar(routines, tasks)
+
+    async def get_events(call: ServiceCall) -> dict[str, Any]:
+        """Stand in for a calendar that takes a moment to answer."""
+        await asyncio.sleep(0.001)
+        return {call.data["entity_id"]: {"events": calendar}}
+
+    hass.services.async_register(
+        "calendar", "get_events", get_events, supports_response=SupportsResponse.ONLY
+    )
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Benchmark",
+        data={"name": "Benchmark", "calendar_entity": CALENDAR_ENTITY},
+        options={},
+        source="user",
+    )
+    coordinator = KidsScheduleCoordinator(hass, entry)
+
+    async def refresh() -> None:
+        # As after a calendar change: refetch and rebuild every routine
+        coordinator.fetcher.invalidate(CALENDAR_ENTITY)
+        coordinator._calendar_changed = True
+        await coordinator.async_refresh()
+
+    try:
+        await coordinator.async_refresh()
+        routine_ids = sorted(coordinator.data["daily"])
+
+        rng = random.Random(seed)
+        # Sorted by arrival time
+        plan = sorted(
+            (
+                rng.uniform(0, spread_ms / 1000),
+                rng.choice(routine_ids),
+                rng.randrange(tasks),
+                rng.random() < 0.7,
+            )
+            for _ in range(taps)
+        )
+        # The queue applies taps in arrival order, so the last one wins
+        expected = {
+            (routine_id, index): done for _, routine_id, index, done in plan
+        }
+
+        latencies: list[float] = []
+
+        async def tap(delay: float, routine_id: str, index: int, done: bool) -> None:
+            await asyncio.sleep(delay)
+            started = time.perf_counter()
+            if done:
+                await coordinator.async_check_task(routine_id, index)
+            else:
+                await coordinator.async_uncheck_task(routine_id, index)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        calls = [tap(*operation) for operation in plan]
+        # Spread the refreshes through the burst
+        step = max(len(calls) // (refreshes + 1), 1)
+        for position in range(refreshes, 0, -1):
+            calls.insert(position * step, refresh())
+
+        started = time.perf_counter()
+        await asyncio.gather(*calls)
+        elapsed = time.perf_counter() - started
+
+        daily = coordinator.data["daily"]
+        lost = sum(
+            bool(daily[routine_id]["completed_mask"] >> index & 1) != done
+            for (routine_id, index), done in expected.items()
+        )
+
+        # Let the delayed write happen, as it would without a shutdown flush
+        await asyncio.sleep(save_delay + 0.1)
+        await hass.async_block_till_done()
+
+        store = KidsScheduleStore(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}_{entry.entry_id}"
+        )
+        saved = (await store.async_load() or {}).get("routines", {})
+        lost_saved = sum(
+            bool(saved.get(routine_id, {}).get("mask", 0) >> index & 1) != done
+            for (routine_id, index), done in expected.items()
+        )
+
+        counters = coordinator.metrics.as_dict()["counters"]
+        return {
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "taps_per_s": round(taps / elapsed, 1),
+            "latency_p50_ms": round(statistics.median(latencies), 3),
+            "latency_max_ms": round(max(latencies), 3),
+            "batches": counters.get("mutation_batches", 0),
+            "store_writes": counters.get("store_writes", 0),
+            "lost_updates": lost,
+            "lost_saved_updates": lost_saved,
+        }
+    finally:
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+
+def _scenario_key(scenario: dict[str, Any]) -> str:
+    """Return a stable name for a scenario."""
+    return (
+        f"taps={scenario['taps']} routines={scenario['routines']} "
+        f"tasks={scenario['tasks']} refreshes={scenario['refreshes']}"
+    )
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    """Print one line per scenario."""
+    columns = list(next(iter(results.values())))
+    print(f"{'scenario':<48}" + "".join(f"{name:>20}" for name in columns))
+    for key, result in results.items():
+        print(f"{key:<48}" + "".join(f"{result[name]:>20}" for name in columns))
+
+
+async def main() -> None:
+    """Run the load test matrix."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--taps", type=_int_list, default=[10, 100, 500])
+    parser.add_argument("--routines", type=_int_list, default=[4])
+    parser.add_argument("--tasks", type=_int_list, default=[10])
+    parser.add_argument("--refreshes", type=_int_list, default=[0, 5])
+    parser.add_argument(
+        "--spread", type=float, default=20, help="milliseconds the taps arrive over"
+    )
+    parser.add_argument(
+        "--save-delay",
+        type=float,
+        default=SAVE_DELAY,
+        help="seconds between a change and its write",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    coordinator_module.SAVE_DELAY = args.save_delay
+
+    results = {}
+    for taps, routines, tasks, refreshes in itertools.product(
+        args.taps, args.routines, args.tasks, args.refreshes
+    ):
+        scenario = {
+            "taps": taps,
+            "routines": routines,
+            "tasks": tasks,
+            "refreshes": refreshes,
+        }
+        # A fresh config directory, so no scenario sees another's saved state
+        with tempfile.TemporaryDirectory() as config_dir:
+            results[_scenario_key(scenario)] = await run_scenario(
+                config_dir,
+                **scenario,
+                spread_ms=args.spread,
+                save_delay=args.save_delay,
+                seed=args.seed,
+            )
+
+    _print_results(results)
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "version": json.loads(MANIFEST.read_text())["version"],
+                    "python": platform.python_version(),
+                    "spread_ms": args.spread,
+                    "save_delay": args.save_delay,
+                    "seed": args.seed,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    lost = sum(
+        result["lost_updates"] + result["lost_saved_updates"]
+        for result in results.values()
+    )
+    if lost:
+        raise SystemExit(f"{lost} updates were lost")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
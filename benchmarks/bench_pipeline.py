@@ -0,0 +1,345 @@
+"""Benchmark the Kids Schedule refresh, parse and sensor-render pipeline.
+
+Run from the repository root (Home Assistant must be installed):
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --events 10,500 --formats yaml --json out.json
+    python -m benchmarks.bench_pipeline --compare out.json
+
+Every scenario runs against a real, unstarted Home Assistant core whose
+calendar.get_events service is a local stand-in serving a synthetic calendar.
+Each stage reports the median and best wall time over the repeats and, from
+a separate traced run, its peak memory allocation.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import itertools
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.util import dt as dt_util
+
+from custom_components.kids_schedule.const import DOMAIN
+from custom_components.kids_schedule.coordinator import KidsScheduleCoordinator
+from custom_components.kids_schedule.parser import TaskTemplateCache, _parse_yaml
+from custom_components.kids_schedule.sensor import (
+    KidsScheduleCurrentRoutineSensor,
+    KidsScheduleDailySensor,
+    KidsScheduleWeeklySensor,
+)
+
+from .calendar_generator import FORMAT_YAML, FORMATS, make_calendar
+
+CALENDAR_ENTITY = "calendar.benchmark"
+MANIFEST = Path(__file__).parent.parent / "custom_components" / DOMAIN / "manifest.json"
+
+Stage = Callable[[], Any]
+
+
+def _int_list(value: str) -> list[int]:
+    """Parse a comma separated list of integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def _str_list(value: str) -> list[str]:
+    """Parse a comma separated list of strings."""
+    return [item for item in value.split(",") if item]
+
+
+async def _measure(stage: Stage, repeat: int) -> dict[str, float]:
+    """Time a stage and trace its peak memory."""
+
+    async def run() -> None:
+        result = stage()
+        if isinstance(result, Awaitable):
+            await result
+
+    # One untimed call so caches and lazy imports don't skew the first repeat
+    await run()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Traced separately, tracemalloc slows everything it watches
+    tracemalloc.start()
+    try:
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def run_scenario(
+    config_dir: str,
+    *,
+    events: int,
+    tasks_per_event: int,
+    fmt: str,
+    days: int,
+    horizon: int,
+    unique_descriptions: bool,
+    repeat: int,
+) -> dict[str, dict[str, float]]:
+    """Run every stage for one synthetic calendar."""
+    hass = HomeAssistant(config_dir)
+    calendar = make_calendar(
+        dt_util.now(),
+        events=events,
+        tasks_per_event=tasks_per_event,
+        fmt=fmt,
+        days=days,
+        unique_descriptions=unique_descriptions,
+    )
+    parsed_calendar = [
+        (dt_util.parse_datetime(e["start"]), dt_util.parse_datetime(e["end"]), e)
+        for e in calendar
+    ]
+
+    async def get_events(call: ServiceCall) -> dict[str, Any]:
+        """Stand in for calendar.get_events."""
+        start = dt_util.parse_datetime(call.data["start_date_time"])
+        end = dt_util.parse_datetime(call.data["end_date_time"])
+        return {
+            call.data["entity_id"]: {
+                "events": [
+                    event
+                    for event_start, event_end, event in parsed_calendar
+                    if event_start < end and event_end > start
+                ]
+            }
+        }
+
+    hass.services.async_register(
+        "calendar", "get_events", get_events, supports_response=SupportsResponse.ONLY
+    )
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Benchmark",
+        data={"name": "Benchmark", "calendar_entity": CALENDAR_ENTITY},
+        options={"horizon_days": horizon},
+        source="user",
+    )
+    coordinator = KidsScheduleCoordinator(hass, entry)
+    fetcher = coordinator._fetcher
+
+    def forget_fetches() -> None:
+        """Make the next refresh call the calendar service again."""
+        fetcher._recent.clear()
+
+    def forget_everything() -> None:
+        """Make the next refresh fetch and parse from scratch."""
+        forget_fetches()
+        fetcher._parsed.clear()
+        coordinator._horizon.clear()
+        fetcher.task_cache.clear()
+
+    start_of_day = dt_util.start_of_local_day()
+    end_of_day = start_of_day + timedelta(days=1)
+    end_of_horizon = start_of_day + timedelta(days=horizon)
+
+    # Prime state loading and the snapshot the sensors render
+    coordinator.data = await coordinator._async_update_data()
+    window = await coordinator._get_calendar_events(start_of_day, end_of_horizon)
+    horizon_events = window.events
+    day_events = [
+        event
+        for event in horizon_events
+        if coordinator._event_overlaps(event, start_of_day, end_of_day)
+    ]
+    descriptions = [event.get("description", "") for event in horizon_events]
+
+    def parse_descriptions(cache: TaskTemplateCache) -> None:
+        for description in descriptions:
+            cache.get(description)
+
+    warm_cache = TaskTemplateCache(maxsize=max(len(descriptions), 1))
+    parse_descriptions(warm_cache)
+
+    async def fetch() -> None:
+        forget_fetches()
+        await coordinator._get_calendar_events(start_of_day, end_of_horizon)
+
+    async def refresh_cold() -> None:
+        forget_everything()
+        await coordinator._async_update_data()
+
+    async def refresh_warm() -> None:
+        # As after a calendar change signal that changed nothing
+        forget_fetches()
+        coordinator._calendar_changed = True
+        await coordinator._async_update_data()
+
+    async def refresh_rollover() -> None:
+        # As at midnight: one day enters the window
+        forget_fetches()
+        buckets = coordinator._horizon.buckets
+        del buckets[max(buckets)]
+        await coordinator._async_update_data()
+
+    sensors = {
+        "daily": KidsScheduleDailySensor(coordinator, entry),
+        "weekly": KidsScheduleWeeklySensor(coordinator, entry),
+        "current": KidsScheduleCurrentRoutineSensor(coordinator, entry),
+    }
+
+    def render(sensor: Any) -> Stage:
+        def stage() -> None:
+            # A new generation forces the memoized attributes to be rebuilt
+            coordinator.data_generation += 1
+            sensor.extra_state_attributes
+
+        return stage
+
+    stages: dict[str, Stage] = {
+        "fetch": fetch,
+        "parse_descriptions_cold": lambda: parse_descriptions(
+            TaskTemplateCache(maxsize=max(len(descriptions), 1))
+        ),
+        "parse_descriptions_warm": lambda: parse_descriptions(warm_cache),
+        "parse_routines": lambda: coordinator._parse_routines(
+            day_events, start_of_day
+        ),
+        "parse_day_summaries": lambda: coordinator._parse_day_summaries(
+            horizon_events
+        ),
+        "refresh_cold": refresh_cold,
+        "refresh_warm": refresh_warm,
+        "refresh_rollover": refresh_rollover,
+        "select_routines": lambda: coordinator._select_routines(dt_util.now()),
+        **{f"attributes_{name}": render(sensor) for name, sensor in sensors.items()},
+    }
+    if fmt == FORMAT_YAML:
+        # What every description cost before the single-pass scanner; list
+        # descriptions never went through YAML and are not valid YAML
+        stages["parse_descriptions_pyyaml"] = lambda: [
+            _parse_yaml(description) for description in descriptions
+        ]
+
+    results = {}
+    try:
+        for name, stage in stages.items():
+            results[name] = await _measure(stage, repeat)
+    finally:
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return results
+
+
+def _scenario_key(scenario: dict[str, Any]) -> str:
+    """Return a stable name for a scenario."""
+    return (
+        f"events={scenario['events']} tasks={scenario['tasks_per_event']} "
+        f"format={scenario['fmt']} days={scenario['days']} "
+        f"horizon={scenario['horizon']}"
+    )
+
+
+def _print_results(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]] | None,
+) -> None:
+    """Print one table per scenario, with ratios against a baseline."""
+    for key, stages in results.items():
+        print(f"\n{key}")
+        header = f"  {'stage':<26}{'median ms':>12}{'min ms':>12}{'peak KiB':>12}"
+        if baseline is not None:
+            header += f"{'vs base':>10}"
+        print(header)
+        for name, result in stages.items():
+            line = (
+                f"  {name:<26}{result['median_ms']:>12.3f}"
+                f"{result['min_ms']:>12.3f}{result['peak_kib']:>12.1f}"
+            )
+            base = (baseline or {}).get(key, {}).get(name)
+            if base and base["median_ms"]:
+                line += f"{result['median_ms'] / base['median_ms']:>9.2f}x"
+            print(line)
+
+
+async def main() -> None:
+    """Run the benchmark matrix."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=_int_list, default=[10, 100, 500])
+    parser.add_argument("--tasks", type=_int_list, default=[3, 10])
+    parser.add_argument("--formats", type=_str_list, default=list(FORMATS))
+    parser.add_argument("--days", type=_int_list, default=[7])
+    parser.add_argument("--horizon", type=_int_list, default=[7])
+    parser.add_argument(
+        "--shared-descriptions",
+        action="store_true",
+        help="reuse descriptions like recurring events do",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        for events, tasks, fmt, days, horizon in itertools.product(
+            args.events, args.tasks, args.formats, args.days, args.horizon
+        ):
+            scenario = {
+                "events": events,
+                "tasks_per_event": tasks,
+                "fmt": fmt,
+                "days": days,
+                "horizon": horizon,
+            }
+            results[_scenario_key(scenario)] = await run_scenario(
+                config_dir,
+                **scenario,
+                unique_descriptions=not args.shared_descriptions,
+                repeat=args.repeat,
+            )
+
+    _print_results(results, baseline)
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "version": json.loads(MANIFEST.read_text())["version"],
+                    "python": platform.python_version(),
+                    "repeat": args.repeat,
+                    "shared_descriptions": args.shared_descriptions,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
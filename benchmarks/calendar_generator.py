@@ -0,0 +1,98 @@
+"""Synthetic calendars for the Kids Schedule benchmarks."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+from typing import Any
+
+FORMAT_YAML = "yaml"
+FORMAT_LIST = "list"
+FORMATS = (FORMAT_YAML, FORMAT_LIST)
+
+_TITLES = (
+    "Morning Routine",
+    "After School",
+    "Homework",
+    "Piano Practice",
+    "Bedtime Routine",
+    "Weekend Chores",
+)
+_TASKS = (
+    "Brush teeth",
+    "Get dressed",
+    "Make bed",
+    "Eat breakfast",
+    "Pack backpack",
+    "Put on shoes",
+    "Wash hands",
+    "Read for 20 minutes",
+    "Tidy room",
+    "Put on pajamas",
+)
+
+
+def make_description(
+    fmt: str, tasks: int, rng: random.Random, variant: int | None = None
+) -> str:
+    """Return an event description with the given number of tasks.
+
+    A variant number is appended to one title so descriptions differ, which
+    keeps the parse cache honest for calendars without repeating events.
+    """
+    titles = [rng.choice(_TASKS) for _ in range(tasks)]
+    if variant is not None and titles:
+        titles[0] = f"{titles[0]} {variant}"
+
+    if fmt == FORMAT_LIST:
+        return "\n".join(
+            f"{i + 1}. {title}" if i % 2 else f"- {title}"
+            for i, title in enumerate(titles)
+        )
+
+    lines = ["tasks:"]
+    for title in titles:
+        lines.append(f"  - title: {title}")
+        lines.append(f"    image: /local/kids_schedule/{title.split()[0].lower()}.png")
+        lines.append(f"    duration: {rng.randint(1, 15)}")
+    return "\n".join(lines)
+
+
+def make_calendar(
+    start: datetime,
+    *,
+    events: int,
+    tasks_per_event: int,
+    fmt: str,
+    days: int,
+    unique_descriptions: bool = True,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Return calendar.get_events style events spread evenly over days.
+
+    Events of a day are packed between 06:00 and 22:00 and never overlap.
+    """
+    rng = random.Random(seed)
+    day_start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    per_day = [events // days + (1 if i < events % days else 0) for i in range(days)]
+
+    calendar = []
+    for day, count in enumerate(per_day):
+        if not count:
+            continue
+        slot = timedelta(hours=16) / count
+        for i in range(count):
+            event_start = day_start + timedelta(days=day, hours=6) + slot * i
+            calendar.append(
+                {
+                    "start": event_start.isoformat(),
+                    "end": (event_start + slot * 0.9).isoformat(),
+                    "summary": rng.choice(_TITLES),
+                    "description": make_description(
+                        fmt,
+                        tasks_per_event,
+                        rng,
+                        len(calendar) if unique_descriptions else None,
+                    ),
+                }
+            )
+    return calendar
@@ -1,6 +1,9 @@
 """The Kids Schedule integration."""
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from functools import wraps
 import logging
 from typing import Any
 
@@ -8,11 +11,23 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    callback,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    DATA_FETCHER,
+    DATA_ANNOUNCER,
     CONF_ALEXA_ENTITY,
     CONF_ANNOUNCEMENT_ENABLED,
     CONF_TASK_COMPLETE_ANNOUNCEMENT,
@@ -22,18 +37,35 @@ from .const import (
     SERVICE_UNCHECK_TASK,
     SERVICE_RESET_ROUTINE,
     SERVICE_ANNOUNCE,
+    SERVICE_SET_TASKS,
+    SERVICE_GET_STATISTICS,
+    DEFAULT_STATISTICS_DAYS,
+    DEFAULT_ANNOUNCEMENT_ENABLED,
+    DEFAULT_ROUTINE_START,
     ATTR_ROUTINE_ID,
     ATTR_TASK_INDEX,
     ATTR_MESSAGE,
+    ATTR_TASKS,
+    ATTR_COMPLETED,
+    ATTR_ROUTINE,
+    ATTR_START_DATE,
+    ATTR_END_DATE,
+    ATTR_ENTRY_ID,
     EVENT_ROUTINE_STARTED,
     EVENT_TASK_COMPLETED,
     EVENT_ROUTINE_COMPLETED,
+    EVENT_TASKS_UPDATED,
+    SIGNAL_ENTRY_UNLOADED,
 )
+from .announce import async_get_announcer
 from .coordinator import KidsScheduleCoordinator
+from .images import async_register_image_view
+from .metrics import Metrics
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.TODO]
 
 # Service schemas
 CHECK_TASK_SCHEMA = vol.Schema(
@@ -62,17 +94,56 @@ ANNOUNCE_SCHEMA = vol.Schema(
     }
 )
 
+SET_TASKS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TASKS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ROUTINE_ID): cv.string,
+                        vol.Required(ATTR_TASK_INDEX): cv.positive_int,
+                        vol.Optional(ATTR_COMPLETED, default=True): cv.boolean,
+                    }
+                )
+            ],
+        ),
+    }
+)
+
+GET_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ROUTINE): cv.string,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Kids Schedule from a config entry."""
     coordinator = KidsScheduleCoordinator(hass, entry)
-    
-    await coordinator.async_config_entry_first_refresh()
+
+    if await coordinator.async_warm_start():
+        # Don't let a slow or unreachable calendar hold up startup
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    if coordinator.push_updates:
+        entry.async_on_unload(coordinator.async_start_push_updates())
+    entry.async_on_unload(coordinator.async_start_transitions())
+    entry.async_on_unload(coordinator.async_start_reset_scheduler())
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    async_register_websocket_commands(hass)
+    async_register_image_view(hass)
 
     # Register services
     async def handle_check_task(call: ServiceCall) -> None:
@@ -92,24 +163,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 },
             )
 
-            # Announce if enabled
-            if entry.data.get(CONF_ANNOUNCEMENT_ENABLED) and entry.data.get(
-                CONF_TASK_COMPLETE_ANNOUNCEMENT
-            ):
-                routine = coordinator.data["daily"].get(routine_id)
-                if routine:
-                    completed = routine["completed_count"]
-                    total = routine["total_count"]
-                    
-                    if completed == total:
-                        # Routine complete
-                        message = f"Great job! You finished {routine['title']}!"
-                        if entry.data.get(CONF_ROUTINE_COMPLETE_ANNOUNCEMENT):
-                            await announce_message(hass, entry, message)
-                    else:
-                        # Task complete
-                        message = f"Nice work! {completed} of {total} tasks done."
-                        await announce_message(hass, entry, message)
+            # Announce if enabled, without waiting for the device
+            if message := _progress_message(entry, coordinator, [routine_id]):
+                announce_message(hass, entry, message, key=routine_id)
 
         except ValueError as err:
             _LOGGER.error("Error checking task: %s", err)
@@ -133,40 +189,236 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except ValueError as err:
             _LOGGER.error("Error resetting routine: %s", err)
 
+    async def handle_set_tasks(call: ServiceCall) -> None:
+        """Handle bulk set tasks service call."""
+        operations = [
+            (task[ATTR_ROUTINE_ID], task[ATTR_TASK_INDEX], task[ATTR_COMPLETED])
+            for task in call.data[ATTR_TASKS]
+        ]
+
+        try:
+            changed = await coordinator.async_set_tasks(operations)
+        except ValueError as err:
+            _LOGGER.error("Error setting tasks: %s", err)
+            return
+
+        if not changed:
+            return
+
+        # Fire one event for the whole batch
+        hass.bus.async_fire(
+            EVENT_TASKS_UPDATED,
+            {
+                ATTR_TASKS: [
+                    {
+                        ATTR_ROUTINE_ID: routine_id,
+                        ATTR_TASK_INDEX: task_index,
+                        ATTR_COMPLETED: completed,
+                    }
+                    for routine_id, task_index, completed in changed
+                ]
+            },
+        )
+
+        # Announce at most once, for the routines that gained completed tasks
+        routine_ids = list(
+            dict.fromkeys(
+                routine_id for routine_id, _, completed in changed if completed
+            )
+        )
+        if message := _progress_message(entry, coordinator, routine_ids):
+            announce_message(hass, entry, message, key=" ".join(routine_ids))
+
+    async def handle_get_statistics(call: ServiceCall) -> ServiceResponse:
+        """Handle get statistics service call."""
+        end_date = call.data.get(ATTR_END_DATE) or dt_util.now().date()
+        start_date = call.data.get(ATTR_START_DATE) or end_date - timedelta(
+            days=DEFAULT_STATISTICS_DAYS - 1
+        )
+        if start_date > end_date:
+            raise ServiceValidationError("start_date must not be after end_date")
+
+        if ATTR_ROUTINE in call.data:
+            titles = [call.data[ATTR_ROUTINE]]
+        else:
+            titles = coordinator.history.titles
+
+        return {
+            ATTR_START_DATE: start_date.isoformat(),
+            ATTR_END_DATE: end_date.isoformat(),
+            "routines": {
+                title: coordinator.get_statistics(title, start_date, end_date)
+                for title in titles
+            },
+        }
+
     async def handle_announce(call: ServiceCall) -> None:
         """Handle announce service call."""
         message = call.data[ATTR_MESSAGE]
-        await announce_message(hass, entry, message)
+        announce_message(hass, entry, message)
+
+    @callback
+    def handle_routine_started(event: Event) -> None:
+        """Announce a routine of this entry starting."""
+        if event.data.get(ATTR_ENTRY_ID) != entry.entry_id:
+            return
+        if not (
+            coordinator.get_option(
+                CONF_ANNOUNCEMENT_ENABLED, DEFAULT_ANNOUNCEMENT_ENABLED
+            )
+            and coordinator.get_option(
+                CONF_ROUTINE_START_ANNOUNCEMENT, DEFAULT_ROUTINE_START
+            )
+        ):
+            return
+
+        routine = coordinator.data["daily"].get(event.data[ATTR_ROUTINE_ID])
+        if routine is not None:
+            announce_message(hass, entry, _start_message(routine))
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_ROUTINE_STARTED, handle_routine_started)
+    )
 
     # Register services for this config entry
+    metrics = coordinator.metrics
     hass.services.async_register(
-        DOMAIN, SERVICE_CHECK_TASK, handle_check_task, schema=CHECK_TASK_SCHEMA
+        DOMAIN,
+        SERVICE_CHECK_TASK,
+        _timed(metrics, SERVICE_CHECK_TASK, handle_check_task),
+        schema=CHECK_TASK_SCHEMA,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_UNCHECK_TASK, handle_uncheck_task, schema=UNCHECK_TASK_SCHEMA
+        DOMAIN,
+        SERVICE_UNCHECK_TASK,
+        _timed(metrics, SERVICE_UNCHECK_TASK, handle_uncheck_task),
+        schema=UNCHECK_TASK_SCHEMA,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_RESET_ROUTINE, handle_reset_routine, schema=RESET_ROUTINE_SCHEMA
+        DOMAIN,
+        SERVICE_RESET_ROUTINE,
+        _timed(metrics, SERVICE_RESET_ROUTINE, handle_reset_routine),
+        schema=RESET_ROUTINE_SCHEMA,
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_ANNOUNCE, handle_announce, schema=ANNOUNCE_SCHEMA
+        DOMAIN,
+        SERVICE_SET_TASKS,
+        _timed(metrics, SERVICE_SET_TASKS, handle_set_tasks),
+        schema=SET_TASKS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        _timed(metrics, SERVICE_GET_STATISTICS, handle_get_statistics),
+        schema=GET_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ANNOUNCE,
+        _timed(metrics, SERVICE_ANNOUNCE, handle_announce),
+        schema=ANNOUNCE_SCHEMA,
     )
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: KidsScheduleCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+
+        if not hass.data[DOMAIN]:
+            hass.data.pop(DATA_FETCHER, None)
+            if announcer := hass.data.pop(DATA_ANNOUNCER, None):
+                announcer.async_stop()
 
     return unload_ok
 
 
-async def announce_message(
-    hass: HomeAssistant, entry: ConfigEntry, message: str
+def _timed(
+    metrics: Metrics,
+    service: str,
+    handler: Callable[[ServiceCall], Awaitable[Any]],
+) -> Callable[[ServiceCall], Awaitable[Any]]:
+    """Wrap a service handler so its calls are timed."""
+
+    @wraps(handler)
+    async def _async_timed_handler(call: ServiceCall) -> Any:
+        with metrics.timer(f"service.{service}"):
+            return await handler(call)
+
+    return _async_timed_handler
+
+
+def _start_message(routine: dict[str, Any]) -> str:
+    """Return the announcement for a routine starting."""
+    message = f"It's time for {routine['title']}!"
+    if routine["tasks"] and (title := routine["tasks"][0].title) is not None:
+        # YAML titles are not always strings
+        task = str(title)
+        message += f" First, {task[:1].lower()}{task[1:]}."
+    return message
+
+
+def _progress_message(
+    entry: ConfigEntry,
+    coordinator: KidsScheduleCoordinator,
+    routine_ids: list[str],
+) -> str | None:
+    """Return the announcement for newly completed tasks, if any.
+
+    A finished routine takes precedence over task progress. When several
+    routines are given, progress is reported for the last one.
+    """
+    if not (
+        entry.data.get(CONF_ANNOUNCEMENT_ENABLED)
+        and entry.data.get(CONF_TASK_COMPLETE_ANNOUNCEMENT)
+    ):
+        return None
+
+    routines = [
+        routine
+        for routine_id in routine_ids
+        if (routine := coordinator.data["daily"].get(routine_id))
+    ]
+    if not routines:
+        return None
+
+    finished = [r for r in routines if r["completed_count"] == r["total_count"]]
+    if finished:
+        # Routine complete
+        if not entry.data.get(CONF_ROUTINE_COMPLETE_ANNOUNCEMENT):
+            return None
+        titles = " and ".join(r["title"] for r in finished)
+        return f"Great job! You finished {titles}!"
+
+    # Task complete
+    routine = routines[-1]
+    completed = routine["completed_count"]
+    total = routine["total_count"]
+    return f"Nice work! {completed} of {total} tasks done."
+
+
+@callback
+def announce_message(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    message: str,
+    key: str | None = None,
 ) -> None:
-    """Send announcement to Alexa device."""
+    """Queue an announcement for the Alexa device.
+
+    Messages with the same key replace each other while still queued, so
+    rapid progress updates for one routine are only spoken once.
+    """
     alexa_entity = entry.data.get(CONF_ALEXA_ENTITY) or entry.options.get(
         CONF_ALEXA_ENTITY
     )
@@ -179,26 +431,15 @@ async def announce_message(
         _LOGGER.debug("Announcements disabled, skipping")
         return
 
-    try:
-        # Try Alexa Media Player notify service first
-        await hass.services.async_call(
-            "notify",
-            alexa_entity.replace("media_player.", "alexa_media_"),
-            {
-                "message": message,
-                "data": {"type": "announce"},
-            },
-        )
-    except Exception:
-        # Fallback to TTS
-        try:
-            await hass.services.async_call(
-                "tts",
-                "speak",
-                {
-                    "entity_id": alexa_entity,
-                    "message": message,
-                },
-            )
-        except Exception as err:
-            _LOGGER.warning("Error sending announcement: %s", err)
+    async_get_announcer(hass).async_enqueue(
+        alexa_entity,
+        message,
+        _get_metrics(hass, entry),
+        key=f"{entry.entry_id} {key}" if key is not None else None,
+    )
+
+
+def _get_metrics(hass: HomeAssistant, entry: ConfigEntry) -> Metrics:
+    """Return the entry's metrics, or throwaway ones if it is not loaded."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return coordinator.metrics if coordinator is not None else Metrics()
@@ -0,0 +1,171 @@
+"""Background announcements for Kids Schedule."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import logging
+import time
+
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DATA_ANNOUNCER,
+    ANNOUNCE_COALESCE_DELAY,
+    ANNOUNCE_MIN_INTERVAL,
+)
+from .metrics import Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_announcer(hass: HomeAssistant) -> Announcer:
+    """Return the shared announcer, creating it on first use."""
+    if (announcer := hass.data.get(DATA_ANNOUNCER)) is None:
+        announcer = hass.data[DATA_ANNOUNCER] = Announcer(hass)
+    return announcer
+
+
+@dataclass
+class _DeviceQueue:
+    """Pending announcements of one device."""
+
+    # Coalesce key -> (message, metrics of the entry that queued it)
+    pending: dict[str, tuple[str, Metrics]] = field(default_factory=dict)
+    last_sent: float = float("-inf")
+    task: asyncio.Task[None] | None = None
+
+
+class Announcer:
+    """Queue announcements per device and speak them in the background.
+
+    Messages queued within a short window are spoken as one announcement; a
+    newer message with the same coalesce key replaces the pending one. Each
+    device gets at most one announcement per minimum interval. Whether a
+    device has an Alexa Media Player notify service is remembered until
+    notify services are registered or removed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the announcer."""
+        self.hass = hass
+        self._queues: dict[str, _DeviceQueue] = {}
+        self._has_notify: dict[str, bool] = {}
+        self._unique_keys = itertools.count()
+        self._unsub = [
+            hass.bus.async_listen(event_type, self._async_notify_services_changed)
+            for event_type in (EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED)
+        ]
+
+    @callback
+    def _async_notify_services_changed(self, event: Event) -> None:
+        """Forget remembered notify services when they change."""
+        if event.data.get("domain") == "notify":
+            self._has_notify.clear()
+
+    @callback
+    def async_enqueue(
+        self,
+        device: str,
+        message: str,
+        metrics: Metrics,
+        key: str | None = None,
+    ) -> None:
+        """Queue a message for a device and return immediately."""
+        if key is None:
+            key = f"unique_{next(self._unique_keys)}"
+
+        queue = self._queues.setdefault(device, _DeviceQueue())
+        # Re-insert so a replaced message keeps its place behind newer ones
+        queue.pending.pop(key, None)
+        queue.pending[key] = (message, metrics)
+
+        if queue.task is None:
+            queue.task = self.hass.async_create_background_task(
+                self._async_run(device, queue), f"{DATA_ANNOUNCER} {device}"
+            )
+
+    async def _async_run(self, device: str, queue: _DeviceQueue) -> None:
+        """Speak pending announcements until the device's queue is empty."""
+        try:
+            while queue.pending:
+                delay = max(
+                    ANNOUNCE_COALESCE_DELAY,
+                    queue.last_sent + ANNOUNCE_MIN_INTERVAL - time.monotonic(),
+                )
+                await asyncio.sleep(delay)
+
+                batch = list(queue.pending.values())
+                queue.pending.clear()
+                await self._async_send(
+                    device,
+                    " ".join(message for message, _ in batch),
+                    # One entry's metrics once, even if it queued several
+                    list({id(metrics): metrics for _, metrics in batch}.values()),
+                )
+                queue.last_sent = time.monotonic()
+        finally:
+            queue.task = None
+
+    async def _async_send(
+        self, device: str, message: str, metrics: list[Metrics]
+    ) -> None:
+        """Announce a message on a device, falling back to TTS."""
+        notify_service = device.replace("media_player.", "alexa_media_")
+        if (has_notify := self._has_notify.get(device)) is None:
+            has_notify = self._has_notify[device] = self.hass.services.has_service(
+                "notify", notify_service
+            )
+
+        started = time.perf_counter()
+        counter = "announcements"
+        try:
+            if has_notify:
+                try:
+                    # Alexa Media Player notify service first
+                    await self.hass.services.async_call(
+                        "notify",
+                        notify_service,
+                        {
+                            "message": message,
+                            "data": {"type": "announce"},
+                        },
+                        blocking=True,
+                    )
+                    return
+                except Exception as err:
+                    _LOGGER.debug("Alexa announcement failed, using TTS: %s", err)
+                    for entry_metrics in metrics:
+                        entry_metrics.increment("announcement_fallbacks")
+
+            try:
+                await self.hass.services.async_call(
+                    "tts",
+                    "speak",
+                    {
+                        "entity_id": device,
+                        "message": message,
+                    },
+                    blocking=True,
+                )
+            except Exception as err:
+                counter = "announcement_failures"
+                _LOGGER.warning("Error sending announcement: %s", err)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            for entry_metrics in metrics:
+                entry_metrics.observe("announce", elapsed)
+                entry_metrics.increment(counter)
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop pending announcements and stop the workers."""
+        for unsub in self._unsub:
+            unsub()
+        for queue in self._queues.values():
+            queue.pending.clear()
+            if queue.task is not None:
+                queue.task.cancel()
+        self._queues.clear()
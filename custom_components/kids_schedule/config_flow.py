@@ -21,14 +21,30 @@ from .const import (
     CONF_ROUTINE_COMPLETE_ANNOUNCEMENT,
     CONF_RESET_TIME,
     CONF_REQUIRE_ORDER,
+    CONF_REFRESH_MODE,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_DEBUG_SENSOR,
+    CONF_HORIZON_DAYS,
+    CONF_REMOTE_IMAGES,
+    REFRESH_MODE_PUSH,
+    REFRESH_MODE_POLL,
     DEFAULT_ANNOUNCEMENT_ENABLED,
     DEFAULT_TASK_COMPLETE,
     DEFAULT_ROUTINE_START,
     DEFAULT_ROUTINE_COMPLETE,
     DEFAULT_RESET_TIME,
     DEFAULT_REQUIRE_ORDER,
+    DEFAULT_REFRESH_MODE,
+    DEFAULT_COMPACT_ATTRIBUTES,
+    DEFAULT_DEBUG_SENSOR,
+    DEFAULT_HORIZON_DAYS,
+    DEFAULT_REMOTE_IMAGES,
+    MAX_HORIZON_DAYS,
 )
 
+REFRESH_MODES = [REFRESH_MODE_PUSH, REFRESH_MODE_POLL]
+HORIZON_DAYS = vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_HORIZON_DAYS))
+
 
 class KidsScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Kids Schedule."""
@@ -91,6 +107,26 @@ class KidsScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_REQUIRE_ORDER,
                     default=DEFAULT_REQUIRE_ORDER
                 ): bool,
+                vol.Optional(
+                    CONF_REFRESH_MODE,
+                    default=DEFAULT_REFRESH_MODE
+                ): vol.In(REFRESH_MODES),
+                vol.Optional(
+                    CONF_HORIZON_DAYS,
+                    default=DEFAULT_HORIZON_DAYS
+                ): HORIZON_DAYS,
+                vol.Optional(
+                    CONF_REMOTE_IMAGES,
+                    default=DEFAULT_REMOTE_IMAGES
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=DEFAULT_COMPACT_ATTRIBUTES
+                ): bool,
+                vol.Optional(
+                    CONF_DEBUG_SENSOR,
+                    default=DEFAULT_DEBUG_SENSOR
+                ): bool,
             }
         )
 
@@ -165,6 +201,36 @@ class KidsScheduleOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_REQUIRE_ORDER, DEFAULT_REQUIRE_ORDER
                     ),
                 ): bool,
+                vol.Optional(
+                    CONF_REFRESH_MODE,
+                    default=self.config_entry.options.get(
+                        CONF_REFRESH_MODE, DEFAULT_REFRESH_MODE
+                    ),
+                ): vol.In(REFRESH_MODES),
+                vol.Optional(
+                    CONF_HORIZON_DAYS,
+                    default=self.config_entry.options.get(
+                        CONF_HORIZON_DAYS, DEFAULT_HORIZON_DAYS
+                    ),
+                ): HORIZON_DAYS,
+                vol.Optional(
+                    CONF_REMOTE_IMAGES,
+                    default=self.config_entry.options.get(
+                        CONF_REMOTE_IMAGES, DEFAULT_REMOTE_IMAGES
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=self.config_entry.options.get(
+                        CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_DEBUG_SENSOR,
+                    default=self.config_entry.options.get(
+                        CONF_DEBUG_SENSOR, DEFAULT_DEBUG_SENSOR
+                    ),
+                ): bool,
             }
         )
 
@@ -1,4 +1,5 @@
 """Constants for Kids Schedule integration."""
+from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "kids_schedule"
@@ -14,6 +15,15 @@ CONF_ROUTINE_START_ANNOUNCEMENT: Final = "routine_start_announcement"
 CONF_ROUTINE_COMPLETE_ANNOUNCEMENT: Final = "routine_complete_announcement"
 CONF_RESET_TIME: Final = "reset_time"
 CONF_REQUIRE_ORDER: Final = "require_order"
+CONF_REFRESH_MODE: Final = "refresh_mode"
+CONF_COMPACT_ATTRIBUTES: Final = "compact_attributes"
+CONF_DEBUG_SENSOR: Final = "debug_sensor"
+CONF_HORIZON_DAYS: Final = "horizon_days"
+CONF_REMOTE_IMAGES: Final = "remote_images"
+
+# Refresh modes
+REFRESH_MODE_PUSH: Final = "push"
+REFRESH_MODE_POLL: Final = "poll"
 
 # Defaults
 DEFAULT_RESET_TIME: Final = "00:00:00"
@@ -22,12 +32,31 @@ DEFAULT_ANNOUNCEMENT_ENABLED: Final = True
 DEFAULT_TASK_COMPLETE: Final = True
 DEFAULT_ROUTINE_START: Final = True
 DEFAULT_ROUTINE_COMPLETE: Final = True
+DEFAULT_REFRESH_MODE: Final = REFRESH_MODE_PUSH
+DEFAULT_COMPACT_ATTRIBUTES: Final = False
+DEFAULT_DEBUG_SENSOR: Final = False
+DEFAULT_HORIZON_DAYS: Final = 7
+# Only /local/ images are cached unless remote fetching is allowed
+DEFAULT_REMOTE_IMAGES: Final = False
+
+# Longest schedule, in days, the weekly sensor can cover
+MAX_HORIZON_DAYS: Final = 30
+
+# Sensors fall back to compact attributes above this size (bytes of JSON),
+# which matches the recorder's own limit for stored attributes
+ATTRIBUTE_SIZE_BUDGET: Final = 16384
+
+# Update intervals
+POLL_UPDATE_INTERVAL: Final = timedelta(minutes=1)
+FALLBACK_UPDATE_INTERVAL: Final = timedelta(minutes=30)
 
 # Services
 SERVICE_CHECK_TASK: Final = "check_task"
 SERVICE_UNCHECK_TASK: Final = "uncheck_task"
 SERVICE_RESET_ROUTINE: Final = "reset_routine"
 SERVICE_ANNOUNCE: Final = "announce"
+SERVICE_SET_TASKS: Final = "set_tasks"
+SERVICE_GET_STATISTICS: Final = "get_statistics"
 
 # Attributes
 ATTR_ROUTINE_ID: Final = "routine_id"
@@ -44,12 +73,63 @@ ATTR_END_TIME: Final = "end_time"
 ATTR_IMAGE: Final = "image"
 ATTR_DURATION: Final = "duration"
 ATTR_IS_CURRENT: Final = "is_current"
+ATTR_COMPLETED: Final = "completed"
+ATTR_ROUTINE: Final = "routine"
+ATTR_START_DATE: Final = "start_date"
+ATTR_END_DATE: Final = "end_date"
+ATTR_ROUTINE_TITLE: Final = "routine_title"
+ATTR_ENTRY_ID: Final = "entry_id"
+ATTR_STALE: Final = "stale"
 
 # Event types
 EVENT_ROUTINE_STARTED: Final = "kids_schedule_routine_started"
 EVENT_TASK_COMPLETED: Final = "kids_schedule_task_completed"
 EVENT_ROUTINE_COMPLETED: Final = "kids_schedule_routine_completed"
+EVENT_ROUTINE_ENDED: Final = "kids_schedule_routine_ended"
+EVENT_TASKS_UPDATED: Final = "kids_schedule_tasks_updated"
 
 # Storage
 STORAGE_KEY: Final = "kids_schedule_state"
-STORAGE_VERSION: Final = 1
+STORAGE_VERSION: Final = 3
+SAVE_DELAY: Final = 10
+STORAGE_KEY_HISTORY: Final = "kids_schedule_history"
+STORAGE_VERSION_HISTORY: Final = 1
+# History changes are batched harder; they are never needed to restore state
+HISTORY_SAVE_DELAY: Final = 60
+STORAGE_KEY_SNAPSHOT: Final = "kids_schedule_snapshot"
+STORAGE_VERSION_SNAPSHOT: Final = 1
+# The snapshot is only read at startup
+SNAPSHOT_SAVE_DELAY: Final = 60
+# Days covered by get_statistics when no start date is given
+DEFAULT_STATISTICS_DAYS: Final = 30
+# Days of archived completion summaries kept in the store
+ARCHIVE_RETENTION_DAYS: Final = 30
+
+# Shared calendar fetcher
+DATA_FETCHER: Final = f"{DOMAIN}_fetcher"
+# Seconds a finished fetch is reused by other entries on the same calendar
+FETCH_RESULT_TTL: Final = 5
+
+# Shared announcement queue
+DATA_ANNOUNCER: Final = f"{DOMAIN}_announcer"
+# Seconds to wait for more messages before speaking a batch
+ANNOUNCE_COALESCE_DELAY: Final = 2
+# Minimum seconds between two announcements on the same device
+ANNOUNCE_MIN_INTERVAL: Final = 8
+
+# Dispatcher signal sent when an entry unloads, formatted with its entry ID
+SIGNAL_ENTRY_UNLOADED: Final = f"{DOMAIN}_entry_unloaded_{{}}"
+
+# Shared task image proxy
+DATA_IMAGE_PROXY: Final = f"{DOMAIN}_image_proxy"
+# Under the config folder
+IMAGE_CACHE_DIR: Final = ".cache/kids_schedule/images"
+# Longest side of the thumbnails, in pixels
+IMAGE_SIZES: Final = (128, 256, 512)
+IMAGE_DEFAULT_SIZE: Final = 256
+IMAGE_FETCH_TIMEOUT: Final = 10
+IMAGE_MAX_BYTES: Final = 10 * 1024 * 1024
+# Seconds before a cached source is fetched again to see if it changed
+IMAGE_REVALIDATE_INTERVAL: Final = 24 * 60 * 60
+# Days an image no task uses stays on disk
+IMAGE_CACHE_RETENTION_DAYS: Final = 30
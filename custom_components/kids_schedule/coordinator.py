@@ -1,15 +1,19 @@
 """Data coordinator for Kids Schedule."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
 import logging
+from time import monotonic
 from typing import Any
 
-import yaml
-
-from homeassistant.components.calendar import CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, Event
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, Event, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+)
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
@@ -17,14 +21,57 @@ from homeassistant.util import dt as dt_util
 from .const import (
     DOMAIN,
     CONF_CALENDAR_ENTITY,
+    CONF_REFRESH_MODE,
+    CONF_RESET_TIME,
+    CONF_HORIZON_DAYS,
+    CONF_REMOTE_IMAGES,
+    DEFAULT_REFRESH_MODE,
+    DEFAULT_RESET_TIME,
+    DEFAULT_HORIZON_DAYS,
+    DEFAULT_REMOTE_IMAGES,
+    MAX_HORIZON_DAYS,
+    REFRESH_MODE_PUSH,
+    POLL_UPDATE_INTERVAL,
+    FALLBACK_UPDATE_INTERVAL,
     STORAGE_KEY,
     STORAGE_VERSION,
+    SAVE_DELAY,
+    STORAGE_KEY_HISTORY,
+    STORAGE_VERSION_HISTORY,
+    HISTORY_SAVE_DELAY,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION_SNAPSHOT,
+    SNAPSHOT_SAVE_DELAY,
+    ARCHIVE_RETENTION_DAYS,
     ATTR_TASKS,
     ATTR_IMAGE,
     ATTR_DURATION,
     ATTR_START_TIME,
     ATTR_END_TIME,
     ATTR_ROUTINE_ID,
+    ATTR_ROUTINE_TITLE,
+    ATTR_ENTRY_ID,
+    ATTR_COMPLETED_TASKS,
+    ATTR_TOTAL_TASKS,
+    EVENT_ROUTINE_STARTED,
+    EVENT_ROUTINE_ENDED,
+    EVENT_ROUTINE_COMPLETED,
+)
+from .fetcher import CalendarFetcher, CalendarWindow, async_get_fetcher
+from .horizon import CalendarHorizon, DayBucket, event_time
+from .history import KIND_ROUTINE, KIND_TASK, CompletionHistory
+from .images import ImageProxy, async_get_image_proxy
+from .interval_index import IntervalIndex
+from .metrics import Metrics
+from .mutations import MutationQueue
+from .parser import TaskTemplate
+from .routine import new_routine_tasks, set_completed, set_mask
+from .storage import KidsScheduleStore, compact_state
+from .transitions import (
+    TRANSITION_DAY_END,
+    TRANSITION_END,
+    Transition,
+    TransitionEngine,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,87 +86,452 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
         config_entry: ConfigEntry,
     ) -> None:
         """Initialize the coordinator."""
+        refresh_mode = config_entry.options.get(
+            CONF_REFRESH_MODE,
+            config_entry.data.get(CONF_REFRESH_MODE, DEFAULT_REFRESH_MODE),
+        )
+        self.push_updates = refresh_mode == REFRESH_MODE_PUSH
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=1),
+            # In push mode polling is only a safety net for missed changes
+            update_interval=(
+                FALLBACK_UPDATE_INTERVAL if self.push_updates else POLL_UPDATE_INTERVAL
+            ),
         )
         self.config_entry = config_entry
         self.calendar_entity = config_entry.data[CONF_CALENDAR_ENTITY]
-        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{config_entry.entry_id}")
+        self._store = KidsScheduleStore(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}_{config_entry.entry_id}"
+        )
         self._state: dict[str, dict[str, Any]] = {}
+        # day -> routine ID -> {"completed": n, "total": n}
+        self._archive: dict[str, dict[str, dict[str, int]]] = {}
+        self._state_loaded = False
+        self._pending_writes = 0
+        self._history_store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION_HISTORY,
+            f"{STORAGE_KEY_HISTORY}_{config_entry.entry_id}",
+        )
+        self.history = CompletionHistory()
+        self._history_dirty = False
+        # The last fetched calendar window, so setup need not wait for it
+        self._snapshot_store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION_SNAPSHOT,
+            f"{STORAGE_KEY_SNAPSHOT}_{config_entry.entry_id}",
+        )
+        self._snapshot_fingerprint: str | None = None
+        self._snapshot_dirty = False
+        # True while the schedule is not confirmed by a full calendar fetch
+        self.stale = False
+        self.last_calendar_update: datetime | None = None
         self._routines_cache: dict[str, dict[str, Any]] = {}
+        self._horizon = CalendarHorizon()
+        self._calendar_changed = False
+        self._last_full_fetch = float("-inf")
+        # Fetching and parsing are shared with entries using the same calendar
+        self._fetcher = async_get_fetcher(hass)
+        self._task_cache = self._fetcher.task_cache
+        # Task images are cached and resized by a proxy shared between entries
+        self._images = async_get_image_proxy(hass)
+        self._image_task: asyncio.Task[None] | None = None
+        self._published_image_version = 0
+        # Bumped on every listener update so entities can memoize per snapshot
+        self.data_generation = 0
+        self.events_fingerprint: str | None = None
+        self._day_end: datetime = dt_util.now()
+        # Today's routines by time, rebuilt with every new set of routines
+        self._index = IntervalIndex(())
+        self._transitions = TransitionEngine(hass, self._async_handle_transitions)
+        # Whether the current batch of task changes changed anything, and
+        # the routines it completed
+        self._batch_changed = False
+        self._newly_completed: list[str] = []
+        self.metrics = Metrics()
+        # Task changes from services and to-do lists are applied in order
+        self._mutations = MutationQueue(
+            hass,
+            self._async_commit,
+            self.metrics,
+            f"{DOMAIN} mutations {config_entry.entry_id}",
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from calendar and merge with completion state."""
+        metrics = self.metrics
+        metrics.increment("refreshes")
         try:
-            # Load stored state
-            if not self._state:
-                stored_data = await self._store.async_load()
-                if stored_data:
-                    self._state = stored_data.get("routines", {})
-
-            # Get today's events
-            now = dt_util.now()
-            start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_day = start_of_day + timedelta(days=1)
-
-            # Get events from calendar
-            calendar_events = await self._get_calendar_events(start_of_day, end_of_day)
-            
-            # Get weekly events (7 days)
-            end_of_week = start_of_day + timedelta(days=7)
-            weekly_events = await self._get_calendar_events(start_of_day, end_of_week)
-
-            # Parse routines from events
-            daily_routines = self._parse_routines(calendar_events, now)
-            weekly_routines = self._parse_routines_weekly(weekly_events)
-
-            # Merge with completion state
-            for routine_id, routine in daily_routines.items():
-                if routine_id in self._state:
-                    # Restore completion state
-                    state_tasks = self._state[routine_id].get("tasks", [])
-                    for i, task in enumerate(routine.get("tasks", [])):
-                        if i < len(state_tasks):
-                            task["completed"] = state_tasks[i].get("completed", False)
-
-            return {
-                "daily": daily_routines,
-                "weekly": weekly_routines,
-                "current_routine": self._get_current_routine(daily_routines, now),
-                "next_routine": self._get_next_routine(daily_routines, now),
-            }
+            with metrics.timer("refresh"):
+                # Load stored state
+                if not self._state_loaded:
+                    with metrics.timer("refresh.load_state"):
+                        await self._async_load_state()
+
+                now = dt_util.now()
+
+                # Fetch only the days that need it
+                with metrics.timer("refresh.fetch"):
+                    await self._async_update_horizon(now.date())
+
+                return self._build_data(now)
 
         except Exception as err:
+            metrics.increment("refresh_failures")
             _LOGGER.error("Error updating Kids Schedule data: %s", err)
             raise UpdateFailed(f"Error fetching data: {err}") from err
 
+    def _build_data(self, now: datetime) -> dict[str, Any]:
+        """Parse the horizon and merge the completion state into a snapshot."""
+        metrics = self.metrics
+        today = now.date()
+        start_of_day = dt_util.start_of_local_day(today)
+        end_of_day = dt_util.start_of_local_day(today + timedelta(days=1))
+
+        # Parse routines per day (skipped for days that are unchanged)
+        with metrics.timer("refresh.parse"):
+            parsed_daily, weekly_routines = self._parse_horizon(
+                today, start_of_day, end_of_day
+            )
+
+        with metrics.timer("refresh.merge"):
+            daily_routines = self._build_daily_routines(parsed_daily, now)
+            self._day_end = end_of_day
+            self._merge_state(daily_routines)
+            self._index = IntervalIndex(daily_routines.values())
+
+        self._async_warm_images(daily_routines)
+
+        return {
+            "daily": daily_routines,
+            "weekly": weekly_routines,
+            **self._select_routines(now),
+        }
+
+    async def async_warm_start(self) -> bool:
+        """Publish the stored calendar snapshot without waiting for the calendar.
+
+        The snapshot is served as stale until a full fetch succeeds. Returns
+        False if there is no snapshot covering today.
+        """
+        if not self._state_loaded:
+            await self._async_load_state()
+
+        if not (stored := await self._snapshot_store.async_load()):
+            return False
+        if stored.get("calendar_entity") != self.calendar_entity:
+            return False
+        try:
+            self._horizon.restore(stored["days"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Discarding unreadable schedule snapshot: %s", err)
+            self._horizon.clear()
+            return False
+
+        now = dt_util.now()
+        self._horizon.roll(now.date(), self.horizon_days)
+        if now.date() not in self._horizon.buckets:
+            self._horizon.clear()
+            return False
+
+        self._snapshot_fingerprint = self._horizon.fingerprint
+        self.last_calendar_update = dt_util.parse_datetime(stored.get("saved_at", ""))
+        self.stale = True
+        # However old the snapshot, the next refresh fetches every day
+        self._calendar_changed = True
+        self.metrics.increment("warm_starts")
+        self.async_set_updated_data(self._build_data(now))
+        return True
+
+    def _merge_state(self, daily_routines: dict[str, dict[str, Any]]) -> None:
+        """Restore the stored completion state onto fresh routines."""
+        for routine_id, routine in daily_routines.items():
+            if routine_id in self._state:
+                # Restore completion state
+                set_mask(routine, self._state[routine_id].get("mask", 0))
+
+    @property
+    def horizon_days(self) -> int:
+        """Return the number of days, today included, in the schedule."""
+        days = int(self.get_option(CONF_HORIZON_DAYS, DEFAULT_HORIZON_DAYS))
+        return min(max(days, 1), MAX_HORIZON_DAYS)
+
+    async def _async_update_horizon(self, today: date) -> None:
+        """Roll the window over and fetch the days that need it.
+
+        All days are fetched when the calendar signalled a change, when
+        nothing is cached yet and once per fallback interval. Otherwise only
+        days that entered the window are fetched (and, in poll mode, today).
+        """
+        horizon = self._horizon
+        days = self.horizon_days
+        missing = horizon.roll(today, days)
+        # Scheduled refreshes can come a little early; with slack, the
+        # fallback poll that comes an interval later is always a full fetch
+        full = (
+            self._calendar_changed
+            or not horizon.buckets
+            or monotonic() - self._last_full_fetch
+            >= (FALLBACK_UPDATE_INTERVAL - POLL_UPDATE_INTERVAL).total_seconds()
+        )
+        # Cleared before fetching so a change signalled meanwhile is kept
+        self._calendar_changed = False
+
+        if full:
+            ranges = [(today, today + timedelta(days=days))]
+        else:
+            ranges = missing
+            if not self.push_updates and not (ranges and ranges[0][0] == today):
+                ranges.insert(0, (today, today + timedelta(days=1)))
+
+        fetched_all = True
+        for start, end in ranges:
+            window = await self._get_calendar_events(
+                dt_util.start_of_local_day(start), dt_util.start_of_local_day(end)
+            )
+            if window is None:
+                fetched_all = False
+                continue
+            horizon.store(today, start, end, window.events)
+            self.metrics.increment("days_fetched", (end - start).days)
+
+        if not fetched_all:
+            # Keep serving what was fetched before, and retry every day next
+            self.stale = True
+            self._calendar_changed = True
+            return
+
+        if full:
+            self._last_full_fetch = monotonic()
+            self.last_calendar_update = dt_util.utcnow()
+            self.stale = False
+        self._async_schedule_snapshot_save()
+
+    @callback
+    def _async_schedule_snapshot_save(self) -> None:
+        """Persist the calendar window if it changed since it was last saved."""
+        if self._horizon.fingerprint == self._snapshot_fingerprint:
+            return
+        self._snapshot_fingerprint = self._horizon.fingerprint
+        self._snapshot_dirty = True
+        self._snapshot_store.async_delay_save(
+            self._snapshot_data_to_save, SNAPSHOT_SAVE_DELAY
+        )
+
+    @callback
+    def _snapshot_data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to persist, called by the store when it writes."""
+        self._snapshot_dirty = False
+        self.metrics.increment("snapshot_writes")
+        return {
+            "calendar_entity": self.calendar_entity,
+            "saved_at": (self.last_calendar_update or dt_util.utcnow()).isoformat(),
+            "days": self._horizon.as_dict(),
+        }
+
+    def _parse_horizon(
+        self, today: date, start_of_day: datetime, end_of_day: datetime
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, list[dict]]]:
+        """Parse each day, reusing shared results for unchanged days."""
+        self.events_fingerprint = self._horizon.fingerprint
+        self._fetcher.prune_parsed(self.calendar_entity, today.isoformat())
+
+        weekly_routines: dict[str, list[dict]] = {}
+        parsed_daily: dict[str, dict[str, Any]] = {}
+        for day, bucket in self._horizon.buckets.items():
+            day_key = day.isoformat()
+            routines = self._get_or_parse(
+                day_key, bucket, self._parse_day_summaries
+            )
+            if routines:
+                weekly_routines[day_key] = routines
+
+            if day == today:
+                # is_current is recomputed on every refresh by _build_daily_routines
+                parsed_daily = self._get_or_parse(
+                    f"{day_key} daily",
+                    bucket,
+                    lambda events: self._parse_routines(
+                        [
+                            event
+                            for event in events
+                            if self._event_overlaps(event, start_of_day, end_of_day)
+                        ],
+                        start_of_day,
+                    ),
+                )
+
+        return parsed_daily, weekly_routines
+
+    def _get_or_parse(
+        self,
+        key: str,
+        bucket: DayBucket,
+        parse: Callable[[list[dict[str, Any]]], Any],
+    ) -> Any:
+        """Return the shared parse of a day bucket, parsing it if needed."""
+        cached = self._fetcher.get_parsed(
+            self.calendar_entity, key, bucket.fingerprint
+        )
+        if cached is not None:
+            self.metrics.increment("parse_reused")
+            return cached
+
+        self.metrics.increment("events_parsed", len(bucket.events))
+        parsed = parse(bucket.events)
+        self._fetcher.set_parsed(
+            self.calendar_entity, key, bucket.fingerprint, parsed
+        )
+        return parsed
+
+    def _build_daily_routines(
+        self, parsed_daily: dict[str, dict[str, Any]], now: datetime
+    ) -> dict[str, dict[str, Any]]:
+        """Copy cached routines so completion state never leaks into the cache.
+
+        The task templates are immutable and shared; only the mask differs.
+        """
+        return {
+            routine_id: {
+                **routine,
+                "is_current": routine["start_time"] <= now < routine["end_time"],
+            }
+            for routine_id, routine in parsed_daily.items()
+        }
+
+    @staticmethod
+    def _event_overlaps(event: dict, start: datetime, end: datetime) -> bool:
+        """Return True if the event overlaps the given range."""
+        event_start = event_time(event.get("start", ""))
+        event_end = event_time(event.get("end", ""))
+        if event_start is None or event_end is None:
+            return False
+        return event_start < end and event_end > start
+
+    async def _async_load_state(self) -> None:
+        """Load completion state and compact anything left from past days."""
+        stored_data = await self._store.async_load()
+        if stored_data:
+            self._state = stored_data.get("routines", {})
+            self._archive = stored_data.get("archive", {})
+
+        if stored_history := await self._history_store.async_load():
+            try:
+                self.history = CompletionHistory.from_dict(stored_history)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Discarding unreadable completion history: %s", err)
+        self._state_loaded = True
+
+        if compact_state(
+            self._state, self._archive, dt_util.now().date(), ARCHIVE_RETENTION_DAYS
+        ):
+            self._async_schedule_save()
+
+    def get_option(self, key: str, default: Any = None) -> Any:
+        """Return a config value, preferring options over initial data."""
+        return self.config_entry.options.get(
+            key, self.config_entry.data.get(key, default)
+        )
+
+    @callback
+    def async_start_reset_scheduler(self) -> CALLBACK_TYPE:
+        """Run the daily reset at the configured reset time."""
+        reset_time = dt_util.parse_time(
+            self.get_option(CONF_RESET_TIME, DEFAULT_RESET_TIME) or ""
+        ) or time()
+
+        return async_track_time_change(
+            self.hass,
+            self._async_handle_reset,
+            hour=reset_time.hour,
+            minute=reset_time.minute,
+            second=reset_time.second,
+        )
+
+    async def _async_handle_reset(self, now: datetime) -> None:
+        """Archive the finished day and compact the store."""
+        if compact_state(
+            self._state, self._archive, now.date(), ARCHIVE_RETENTION_DAYS
+        ):
+            _LOGGER.debug("Archived completion state before %s", now.date())
+            self._async_schedule_save()
+
+        await self.async_request_refresh()
+
+    def get_statistics(
+        self, title: str, start_date: date, end_date: date
+    ) -> dict[str, Any]:
+        """Return completion statistics of a routine for a range of days."""
+        start = dt_util.start_of_local_day(start_date)
+        end = dt_util.start_of_local_day(end_date + timedelta(days=1))
+        return self.history.statistics(
+            title,
+            start.timestamp(),
+            end.timestamp(),
+            start_date.toordinal(),
+            end_date.toordinal(),
+        )
+
+    @callback
+    def _async_warm_images(self, routines: dict[str, dict[str, Any]]) -> None:
+        """Cache today's task images in the background."""
+        if self._image_task is not None and not self._image_task.done():
+            return
+        # YAML can give an image of any type
+        sources = {
+            task.image
+            for routine in routines.values()
+            for task in routine["tasks"]
+            if isinstance(task.image, str) and task.image
+        }
+        if sources:
+            self._image_task = self.hass.async_create_background_task(
+                self._async_warm_images_task(sources),
+                f"{DOMAIN} images {self.config_entry.entry_id}",
+            )
+
+    async def _async_warm_images_task(self, sources: set[str]) -> None:
+        """Warm the image cache and republish if image URLs changed."""
+        await self._images.async_warm(
+            sources,
+            self.metrics,
+            remote=self.get_option(CONF_REMOTE_IMAGES, DEFAULT_REMOTE_IMAGES),
+        )
+        # Another entry may have cached our images first
+        if self._images.version != self._published_image_version and self.data:
+            self.async_update_listeners()
+
+    @property
+    def images(self) -> ImageProxy:
+        """Return the task image proxy shared with other entries."""
+        return self._images
+
+    @property
+    def fetcher(self) -> CalendarFetcher:
+        """Return the calendar fetcher shared with other entries."""
+        return self._fetcher
+
+    @property
+    def archive(self) -> dict[str, dict[str, dict[str, int]]]:
+        """Return the archived per-day completion summaries."""
+        return self._archive
+
     async def _get_calendar_events(
         self, start: datetime, end: datetime
-    ) -> list[CalendarEvent]:
-        """Get calendar events for a date range."""
+    ) -> CalendarWindow | None:
+        """Get calendar events for a date range, or None if that failed."""
         try:
-            # Call calendar.get_events service
-            response = await self.hass.services.async_call(
-                "calendar",
-                "get_events",
-                {
-                    "entity_id": self.calendar_entity,
-                    "start_date_time": start.isoformat(),
-                    "end_date_time": end.isoformat(),
-                },
-                blocking=True,
-                return_response=True,
+            return await self._fetcher.async_get_events(
+                self.calendar_entity, start, end
             )
-            
-            events = response.get(self.calendar_entity, {}).get("events", [])
-            return events
 
         except Exception as err:
+            self.metrics.increment("fetch_errors")
             _LOGGER.error("Error getting calendar events: %s", err)
-            return []
+            return None
 
     def _parse_routines(
         self, events: list[dict], now: datetime
@@ -133,9 +545,9 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
                 
                 # Parse YAML from description
                 description = event.get("description", "")
-                tasks = self._parse_tasks_from_description(description)
+                templates = self._parse_tasks_from_description(description)
 
-                if not tasks:
+                if not templates:
                     continue
 
                 start = dt_util.parse_datetime(event["start"])
@@ -146,10 +558,8 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
                     "title": event.get("summary", "Routine"),
                     "start_time": start,
                     "end_time": end,
-                    "is_current": start <= now <= end,
-                    "tasks": tasks,
-                    "completed_count": sum(1 for t in tasks if t.get("completed", False)),
-                    "total_count": len(tasks),
+                    "is_current": start <= now < end,
+                    **new_routine_tasks(templates),
                 }
 
             except Exception as err:
@@ -158,23 +568,18 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
 
         return routines
 
-    def _parse_routines_weekly(self, events: list[dict]) -> dict[str, list[dict]]:
-        """Parse events into weekly structure grouped by day."""
-        weekly = {}
+    def _parse_day_summaries(self, events: list[dict]) -> list[dict]:
+        """Parse the events of one day into task-free routine summaries."""
+        routines = []
 
         for event in events:
             try:
                 start = dt_util.parse_datetime(event["start"])
-                day_key = start.strftime("%Y-%m-%d")
-
-                if day_key not in weekly:
-                    weekly[day_key] = []
-
                 routine_id = self._generate_routine_id(event)
                 description = event.get("description", "")
                 tasks = self._parse_tasks_from_description(description)
 
-                weekly[day_key].append({
+                routines.append({
                     "id": routine_id,
                     "title": event.get("summary", "Routine"),
                     "start_time": start,
@@ -186,51 +591,13 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
                 _LOGGER.warning("Error parsing weekly routine: %s", err)
                 continue
 
-        return weekly
-
-    def _parse_tasks_from_description(self, description: str) -> list[dict[str, Any]]:
-        """Parse tasks from event description (YAML or simple list)."""
-        tasks = []
-
-        try:
-            # Try parsing as YAML
-            if "tasks:" in description:
-                data = yaml.safe_load(description)
-                if isinstance(data, dict) and "tasks" in data:
-                    for task in data["tasks"]:
-                        if isinstance(task, dict):
-                            tasks.append({
-                                "title": task.get("title", "Task"),
-                                "image": task.get("image"),
-                                "duration": task.get("duration", 5),
-                                "completed": False,
-                            })
-                        elif isinstance(task, str):
-                            tasks.append({
-                                "title": task,
-                                "image": None,
-                                "duration": 5,
-                                "completed": False,
-                            })
-            else:
-                # Parse as simple list (lines starting with - or numbers)
-                lines = description.strip().split("\n")
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith("-") or line[0].isdigit():
-                        title = line.lstrip("-0123456789.").strip()
-                        if title:
-                            tasks.append({
-                                "title": title,
-                                "image": None,
-                                "duration": 5,
-                                "completed": False,
-                            })
-
-        except Exception as err:
-            _LOGGER.warning("Error parsing tasks from description: %s", err)
+        return routines
 
-        return tasks
+    def _parse_tasks_from_description(
+        self, description: str
+    ) -> tuple[TaskTemplate, ...]:
+        """Parse tasks from event description, memoized by content hash."""
+        return self._task_cache.get(description)
 
     def _generate_routine_id(self, event: dict) -> str:
         """Generate a unique routine ID from event data."""
@@ -238,52 +605,159 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
         summary = event.get("summary", "")
         return f"{start}_{summary}".replace(" ", "_").replace(":", "")
 
-    def _get_current_routine(
-        self, routines: dict[str, dict], now: datetime
-    ) -> dict[str, Any] | None:
-        """Get the currently active routine."""
-        for routine in routines.values():
-            if routine["is_current"]:
-                return routine
-        return None
-
-    def _get_next_routine(
-        self, routines: dict[str, dict], now: datetime
-    ) -> dict[str, Any] | None:
-        """Get the next upcoming routine."""
-        future_routines = [
-            r for r in routines.values() if r["start_time"] > now
-        ]
-        if future_routines:
-            return min(future_routines, key=lambda r: r["start_time"])
-        return None
-
-    async def async_check_task(self, routine_id: str, task_index: int) -> None:
-        """Mark a task as complete."""
-        if routine_id not in self.data["daily"]:
-            raise ValueError(f"Routine {routine_id} not found")
+    def _select_routines(self, now: datetime) -> dict[str, Any]:
+        """Return the active, current and next routines at a time."""
+        active = self._index.active(now)
+        return {
+            "active_routines": active,
+            # Of overlapping routines, the one that started first is current
+            "current_routine": active[0] if active else None,
+            "next_routine": self._index.next(now),
+        }
+
+    @callback
+    def async_start_push_updates(self) -> CALLBACK_TYPE:
+        """Refresh when the calendar entity changes.
+
+        Returns a callback that stops listening.
+        """
+        return async_track_state_change_event(
+            self.hass, [self.calendar_entity], self._async_handle_calendar_change
+        )
 
-        routine = self.data["daily"][routine_id]
-        if task_index < 0 or task_index >= len(routine["tasks"]):
-            raise ValueError(f"Task index {task_index} out of range")
+    @callback
+    def _async_handle_calendar_change(self, event: Event) -> None:
+        """Refetch every day when the calendar entity changes."""
+        self._calendar_changed = True
+        self._fetcher.invalidate(self.calendar_entity)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_start_transitions(self) -> CALLBACK_TYPE:
+        """Fire routine start and end events exactly on time.
+
+        Returns a callback that stops the transition engine.
+        """
+        unsub_listener = self.async_add_listener(self._async_update_transitions)
+        self._async_update_transitions()
+
+        @callback
+        def _async_stop() -> None:
+            unsub_listener()
+            self._transitions.async_stop()
+
+        return _async_stop
+
+    @callback
+    def _async_update_transitions(self) -> None:
+        """Reschedule transitions of new or changed routines."""
+        if self.data:
+            self._transitions.async_update(self.data["daily"], self._day_end)
+
+    @callback
+    def _async_handle_transitions(
+        self, now: datetime, transitions: list[Transition]
+    ) -> None:
+        """Flip is_current and fire events without re-querying the calendar."""
+        if not self.data:
+            return
 
-        routine["tasks"][task_index]["completed"] = True
-        routine["completed_count"] = sum(1 for t in routine["tasks"] if t["completed"])
+        daily_routines = self.data["daily"]
+        for routine in daily_routines.values():
+            routine["is_current"] = routine["start_time"] <= now < routine["end_time"]
 
-        # Update state storage
-        if routine_id not in self._state:
-            self._state[routine_id] = {"tasks": []}
+        self.async_set_updated_data({**self.data, **self._select_routines(now)})
 
-        while len(self._state[routine_id]["tasks"]) <= task_index:
-            self._state[routine_id]["tasks"].append({"completed": False})
+        # Ends first, so a routine ending as the next starts reads naturally
+        for transition in sorted(
+            transitions, key=lambda t: t.kind != TRANSITION_END
+        ):
+            if (routine := daily_routines.get(transition.routine_id)) is None:
+                continue
+            self._fire_routine_event(
+                EVENT_ROUTINE_ENDED
+                if transition.kind == TRANSITION_END
+                else EVENT_ROUTINE_STARTED,
+                routine,
+            )
 
-        self._state[routine_id]["tasks"][task_index]["completed"] = True
+        if any(t.kind == TRANSITION_DAY_END for t in transitions):
+            # A new day needs a new calendar window; routines ending at
+            # midnight have had their events first
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _fire_routine_event(self, event_type: str, routine: dict[str, Any]) -> None:
+        """Fire a routine event on the bus."""
+        self.hass.bus.async_fire(
+            event_type,
+            {
+                ATTR_ENTRY_ID: self.config_entry.entry_id,
+                ATTR_ROUTINE_ID: routine["id"],
+                ATTR_ROUTINE_TITLE: routine["title"],
+                ATTR_START_TIME: routine["start_time"].isoformat(),
+                ATTR_END_TIME: routine["end_time"].isoformat(),
+                ATTR_COMPLETED_TASKS: routine["completed_count"],
+                ATTR_TOTAL_TASKS: routine["total_count"],
+            },
+        )
 
-        await self._save_state()
-        await self.async_request_refresh()
+    async def async_check_task(self, routine_id: str, task_index: int) -> None:
+        """Mark a task as complete."""
+        await self.async_set_tasks([(routine_id, task_index, True)])
 
     async def async_uncheck_task(self, routine_id: str, task_index: int) -> None:
         """Mark a task as incomplete."""
+        await self.async_set_tasks([(routine_id, task_index, False)])
+
+    async def async_set_tasks(
+        self, operations: list[tuple[str, int, bool]]
+    ) -> list[tuple[str, int, bool]]:
+        """Set the completion of several tasks at once.
+
+        Every operation is validated before any is applied. Returns the
+        operations that actually changed a task, once they are published;
+        they are written to storage shortly after.
+        """
+        return await self._mutations.async_submit(
+            lambda: self._set_tasks(operations)
+        )
+
+    def _set_tasks(
+        self, operations: list[tuple[str, int, bool]]
+    ) -> list[tuple[str, int, bool]]:
+        """Apply task changes to the snapshot; run by the mutation queue."""
+        for routine_id, task_index, _ in operations:
+            self._validate_task(routine_id, task_index)
+
+        changed = [
+            operation for operation in operations if self._apply_task_state(*operation)
+        ]
+        if changed:
+            self._batch_changed = True
+        return changed
+
+    @callback
+    def _async_commit(self) -> None:
+        """Publish a batch of mutations, fire its events and schedule its write.
+
+        Runs after each batch of the mutation queue, so concurrent changes
+        cost a single listener update. Writes are delayed and coalesced, and
+        callers do not wait for them.
+        """
+        if not self._batch_changed:
+            return
+        self._batch_changed = False
+
+        self._async_publish()
+        self._async_schedule_save()
+        newly_completed, self._newly_completed = self._newly_completed, []
+        for routine_id in newly_completed:
+            if routine := self.data["daily"].get(routine_id):
+                self._fire_routine_event(EVENT_ROUTINE_COMPLETED, routine)
+
+    def _validate_task(self, routine_id: str, task_index: int) -> None:
+        """Raise ValueError if the routine or task does not exist."""
         if routine_id not in self.data["daily"]:
             raise ValueError(f"Routine {routine_id} not found")
 
@@ -291,40 +765,148 @@ class KidsScheduleCoordinator(DataUpdateCoordinator):
         if task_index < 0 or task_index >= len(routine["tasks"]):
             raise ValueError(f"Task index {task_index} out of range")
 
-        routine["tasks"][task_index]["completed"] = False
-        routine["completed_count"] = sum(1 for t in routine["tasks"] if t["completed"])
+    def _apply_task_state(
+        self, routine_id: str, task_index: int, completed: bool
+    ) -> bool:
+        """Update one task in the snapshot and state storage.
+
+        Returns False if the task already had the requested state.
+        """
+        routine = self.data["daily"][routine_id]
+        if not set_completed(routine, task_index, completed):
+            return False
 
         # Update state storage
-        if routine_id in self._state and task_index < len(self._state[routine_id]["tasks"]):
-            self._state[routine_id]["tasks"][task_index]["completed"] = False
+        routine_state = self._state.setdefault(routine_id, {})
+        routine_state["mask"] = routine["completed_mask"]
+        routine_state["total"] = routine["total_count"]
 
-        await self._save_state()
-        await self.async_request_refresh()
+        if completed:
+            self._record_completion(routine, routine_state, task_index)
+        return True
+
+    def _record_completion(
+        self,
+        routine: dict[str, Any],
+        routine_state: dict[str, Any],
+        task_index: int,
+    ) -> None:
+        """Append a task completion, and a routine completion if it was the last."""
+        now = dt_util.now()
+        timestamp = now.timestamp()
+        day = dt_util.as_local(routine["start_time"]).date().toordinal()
+        duration = (now - routine["start_time"]).total_seconds()
+
+        self.history.append(
+            KIND_TASK, routine["title"], task_index, timestamp, day, duration
+        )
+        # Unchecking and re-checking the last task records the routine once
+        if (
+            routine["completed_count"] == routine["total_count"]
+            and not routine_state.get("recorded")
+        ):
+            routine_state["recorded"] = True
+            self._newly_completed.append(routine["id"])
+            self.history.append(
+                KIND_ROUTINE, routine["title"], 0, timestamp, day, duration
+            )
+
+        self._history_dirty = True
+        self._history_store.async_delay_save(
+            self._history_data_to_save, HISTORY_SAVE_DELAY
+        )
+
+    @callback
+    def _history_data_to_save(self) -> dict[str, Any]:
+        """Return the history to persist, called by the store when it writes."""
+        self._history_dirty = False
+        self.metrics.increment("history_writes")
+        return self.history.as_dict()
 
     async def async_reset_routine(self, routine_id: str) -> None:
         """Reset all tasks in a routine."""
+        await self._mutations.async_submit(lambda: self._reset_routine(routine_id))
+
+    def _reset_routine(self, routine_id: str) -> None:
+        """Reset a routine in the snapshot; run by the mutation queue."""
         if routine_id not in self.data["daily"]:
             raise ValueError(f"Routine {routine_id} not found")
 
-        routine = self.data["daily"][routine_id]
-        for task in routine["tasks"]:
-            task["completed"] = False
-
-        routine["completed_count"] = 0
+        set_mask(self.data["daily"][routine_id], 0)
 
         # Clear state storage
         if routine_id in self._state:
             del self._state[routine_id]
-
-        await self._save_state()
-        await self.async_request_refresh()
+        self._batch_changed = True
 
     async def async_reset_all(self) -> None:
         """Reset all routines."""
-        self._state = {}
-        await self._save_state()
-        await self.async_request_refresh()
+        await self._mutations.async_submit(self._reset_all)
 
-    async def _save_state(self) -> None:
-        """Save state to storage."""
-        await self._store.async_save({"routines": self._state})
+    def _reset_all(self) -> None:
+        """Reset every routine in the snapshot; run by the mutation queue."""
+        self._state = {}
+        for routine in self.data["daily"].values():
+            set_mask(routine, 0)
+        self._batch_changed = True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Start a new data generation and notify listeners."""
+        self.data_generation += 1
+        self._published_image_version = self._images.version
+        super().async_update_listeners()
+
+    @callback
+    def _async_publish(self) -> None:
+        """Publish the mutated snapshot without a calendar round trip.
+
+        The next scheduled refresh reconciles it with the calendar. Unlike
+        async_set_updated_data, this keeps any refresh already requested and
+        the refresh interval.
+        """
+        self.data = {**self.data}
+        self.async_update_listeners()
+
+    @property
+    def pending_writes(self) -> int:
+        """Return the number of state changes not yet written to storage."""
+        return self._pending_writes
+
+    @property
+    def pending_mutations(self) -> int:
+        """Return the number of task changes waiting to be applied."""
+        return self._mutations.pending
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Coalesce state changes into a single delayed write.
+
+        The store also flushes pending writes on Home Assistant's final write.
+        """
+        self._pending_writes += 1
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist, called by the store when it writes."""
+        self._pending_writes = 0
+        self.metrics.increment("store_writes")
+        return {"routines": self._state, "archive": self._archive}
+
+    async def async_flush_state(self) -> None:
+        """Write pending state changes to storage immediately."""
+        if self._pending_writes:
+            await self._store.async_save(self._data_to_save())
+        if self._history_dirty:
+            await self._history_store.async_save(self._history_data_to_save())
+        if self._snapshot_dirty:
+            await self._snapshot_store.async_save(self._snapshot_data_to_save())
+
+    async def async_shutdown(self) -> None:
+        """Flush pending state and stop the coordinator."""
+        await super().async_shutdown()
+        await self._mutations.async_stop()
+        if self._image_task is not None:
+            self._image_task.cancel()
+        await self.async_flush_state()
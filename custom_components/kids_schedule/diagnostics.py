@@ -0,0 +1,57 @@
+"""Diagnostics support for Kids Schedule."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_ALEXA_ENTITY
+from .coordinator import KidsScheduleCoordinator
+
+TO_REDACT = {CONF_ALEXA_ENTITY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: KidsScheduleCoordinator = hass.data[DOMAIN][entry.entry_id]
+    fetcher = coordinator.fetcher
+    data = coordinator.data or {}
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "push_updates": coordinator.push_updates,
+            "data_generation": coordinator.data_generation,
+            "events_fingerprint": coordinator.events_fingerprint,
+            "stale": coordinator.stale,
+            "last_calendar_update": coordinator.last_calendar_update
+            and coordinator.last_calendar_update.isoformat(),
+            "routines_today": len(data.get("daily", {})),
+            "routines_this_week": sum(
+                len(routines) for routines in data.get("weekly", {}).values()
+            ),
+        },
+        "storage": {
+            "pending_writes": coordinator.pending_writes,
+            "pending_mutations": coordinator.pending_mutations,
+            "archived_days": len(coordinator.archive),
+            "history_events": len(coordinator.history),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        # Shared by every entry, so these cover all of them
+        "fetcher": {
+            "fetches": fetcher.fetches,
+            "coalesced": fetcher.coalesced,
+            "parse_cache": fetcher.task_cache.stats,
+        },
+        "images": coordinator.images.stats,
+    }
@@ -0,0 +1,128 @@
+"""Calendar fetching shared by all Kids Schedule config entries."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import hashlib
+import logging
+import time
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+
+from .const import DATA_FETCHER, FETCH_RESULT_TTL
+from .parser import TaskTemplateCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CalendarWindow(NamedTuple):
+    """Events returned for one calendar entity and time window."""
+
+    events: list[dict[str, Any]]
+    fingerprint: str
+
+
+@callback
+def async_get_fetcher(hass: HomeAssistant) -> CalendarFetcher:
+    """Return the shared fetcher, creating it on first use."""
+    if (fetcher := hass.data.get(DATA_FETCHER)) is None:
+        fetcher = hass.data[DATA_FETCHER] = CalendarFetcher(hass)
+    return fetcher
+
+
+class CalendarFetcher:
+    """Coalesce calendar fetches and share parsed results between entries.
+
+    Concurrent requests for the same entity and window share one in-flight
+    calendar.get_events call, and a finished result is reused for a few
+    seconds so entries refreshing back to back still cost a single fetch.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fetcher."""
+        self.hass = hass
+        self.task_cache = TaskTemplateCache()
+        self.fetches = 0
+        self.coalesced = 0
+        self._in_flight: dict[tuple[str, str, str], asyncio.Task[CalendarWindow]] = {}
+        self._recent: dict[tuple[str, str, str], tuple[float, CalendarWindow]] = {}
+        # (entity, day key) -> (fingerprint, parsed result)
+        self._parsed: dict[tuple[str, str], tuple[str, Any]] = {}
+
+    async def async_get_events(
+        self, entity_id: str, start: datetime, end: datetime
+    ) -> CalendarWindow:
+        """Return the events of a calendar window, sharing concurrent fetches."""
+        key = (entity_id, start.isoformat(), end.isoformat())
+
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < FETCH_RESULT_TTL:
+            self.coalesced += 1
+            return recent[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self._async_fetch(key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # Shield so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, key: tuple[str, str, str]) -> CalendarWindow:
+        """Call calendar.get_events for one window."""
+        entity_id, start, end = key
+        self.fetches += 1
+
+        # Call calendar.get_events service
+        response = await self.hass.services.async_call(
+            "calendar",
+            "get_events",
+            {
+                "entity_id": entity_id,
+                "start_date_time": start,
+                "end_date_time": end,
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+        events = response.get(entity_id, {}).get("events", [])
+        window = CalendarWindow(events, hashlib.sha1(json_bytes(events)).hexdigest())
+
+        # Only the latest result per entity is worth keeping
+        self._recent = {k: v for k, v in self._recent.items() if k[0] != entity_id}
+        self._recent[key] = (time.monotonic(), window)
+        return window
+
+    def invalidate(self, entity_id: str) -> None:
+        """Stop reusing finished fetches of an entity that changed."""
+        self._recent = {k: v for k, v in self._recent.items() if k[0] != entity_id}
+
+    def get_parsed(self, entity_id: str, key: str, fingerprint: str) -> Any | None:
+        """Return a parsed result if the events it came from are unchanged."""
+        cached = self._parsed.get((entity_id, key))
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        return None
+
+    def set_parsed(
+        self, entity_id: str, key: str, fingerprint: str, parsed: Any
+    ) -> None:
+        """Store a parsed result of an entity's events."""
+        self._parsed[(entity_id, key)] = (fingerprint, parsed)
+
+    def prune_parsed(self, entity_id: str, oldest_day: str) -> None:
+        """Drop parsed results of an entity for days before oldest_day.
+
+        Keys start with the ISO date of the day they were parsed for.
+        """
+        self._parsed = {
+            k: v
+            for k, v in self._parsed.items()
+            if k[0] != entity_id or k[1][:10] >= oldest_day
+        }
@@ -0,0 +1,204 @@
+"""Append-only completion history for Kids Schedule."""
+from __future__ import annotations
+
+from array import array
+import base64
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+import sys
+from typing import Any
+
+KIND_TASK = 0
+KIND_ROUTINE = 1
+
+# Column name -> array typecode. Every event has one value in each column.
+_COLUMNS: dict[str, str] = {
+    "timestamps": "d",  # POSIX seconds, non-decreasing
+    "days": "i",  # local date ordinal of the event
+    "kinds": "B",  # KIND_TASK or KIND_ROUTINE
+    "routines": "I",  # index into the titles list
+    "tasks": "H",  # task index, 0 for routine events
+    "durations": "f",  # seconds since the routine started
+}
+
+
+@dataclass
+class _RoutineIndex:
+    """Per-routine indexes that make range statistics logarithmic."""
+
+    task_timestamps: array = field(default_factory=lambda: array("d"))
+    timestamps: array = field(default_factory=lambda: array("d"))
+    # Prefix sums of routine durations; cum_durations[i] covers the first i
+    cum_durations: array = field(default_factory=lambda: array("d", [0.0]))
+    # Distinct days with a routine completion and, for each, the position
+    # where its run of consecutive days starts
+    days: array = field(default_factory=lambda: array("l"))
+    run_starts: array = field(default_factory=lambda: array("l"))
+
+    def add(self, kind: int, timestamp: float, day: int, duration: float) -> None:
+        """Index one event."""
+        if kind == KIND_TASK:
+            self.task_timestamps.append(timestamp)
+            return
+
+        self.timestamps.append(timestamp)
+        self.cum_durations.append(self.cum_durations[-1] + duration)
+        if self.days and self.days[-1] == day:
+            return
+        if self.days and self.days[-1] == day - 1:
+            self.run_starts.append(self.run_starts[-1])
+        else:
+            self.run_starts.append(len(self.days))
+        self.days.append(day)
+
+
+class CompletionHistory:
+    """Column-oriented, append-only log of task and routine completions."""
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self._columns = {name: array(code) for name, code in _COLUMNS.items()}
+        self._titles: list[str] = []
+        self._title_ids: dict[str, int] = {}
+        self._indexes: dict[int, _RoutineIndex] = {}
+
+    def __len__(self) -> int:
+        """Return the number of recorded events."""
+        return len(self._columns["timestamps"])
+
+    @property
+    def titles(self) -> list[str]:
+        """Return the titles of all routines with history."""
+        return list(self._titles)
+
+    def append(
+        self,
+        kind: int,
+        title: str,
+        task_index: int,
+        timestamp: float,
+        day: int,
+        duration: float,
+    ) -> None:
+        """Record one completion event."""
+        timestamps = self._columns["timestamps"]
+        # Keep the log sorted even if the clock steps backwards
+        if timestamps and timestamp < timestamps[-1]:
+            timestamp = timestamps[-1]
+
+        if (routine := self._title_ids.get(title)) is None:
+            routine = self._title_ids[title] = len(self._titles)
+            self._titles.append(title)
+            self._indexes[routine] = _RoutineIndex()
+
+        duration = max(duration, 0.0)
+        self._append_row(kind, routine, task_index, timestamp, day, duration)
+
+    def _append_row(
+        self,
+        kind: int,
+        routine: int,
+        task_index: int,
+        timestamp: float,
+        day: int,
+        duration: float,
+    ) -> None:
+        """Append a row to every column and update the routine's index."""
+        columns = self._columns
+        columns["timestamps"].append(timestamp)
+        columns["days"].append(day)
+        columns["kinds"].append(kind)
+        columns["routines"].append(routine)
+        columns["tasks"].append(task_index)
+        columns["durations"].append(duration)
+        self._indexes[routine].add(kind, timestamp, day, duration)
+
+    def statistics(
+        self, title: str, start: float, end: float, start_day: int, end_day: int
+    ) -> dict[str, Any]:
+        """Return statistics for one routine between two times.
+
+        start/end bound the events (end exclusive); start_day/end_day are the
+        same range as local date ordinals (both inclusive).
+        """
+        index = self._indexes.get(self._title_ids.get(title, -1))
+        if index is None:
+            index = _RoutineIndex()
+
+        lo = bisect_left(index.timestamps, start)
+        hi = bisect_left(index.timestamps, end)
+        completions = hi - lo
+        total_duration = index.cum_durations[hi] - index.cum_durations[lo]
+
+        day_lo = bisect_left(index.days, start_day)
+        day_hi = bisect_right(index.days, end_day)
+        days_in_range = end_day - start_day + 1
+
+        return {
+            "completions": completions,
+            "task_completions": (
+                bisect_left(index.task_timestamps, end)
+                - bisect_left(index.task_timestamps, start)
+            ),
+            "days_completed": day_hi - day_lo,
+            "completion_rate": (
+                round((day_hi - day_lo) / days_in_range * 100)
+                if days_in_range > 0
+                else 0
+            ),
+            "average_duration_minutes": (
+                round(total_duration / completions / 60, 1) if completions else None
+            ),
+            "streak": self._streak(index, end_day),
+        }
+
+    @staticmethod
+    def _streak(index: _RoutineIndex, end_day: int) -> int:
+        """Return the run of consecutive completed days ending at end_day.
+
+        A run that ended the day before still counts, since end_day itself
+        may not be over yet.
+        """
+        position = bisect_right(index.days, end_day) - 1
+        if position < 0 or index.days[position] < end_day - 1:
+            return 0
+        return position - index.run_starts[position] + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a compact, JSON serializable representation."""
+        return {
+            "byteorder": sys.byteorder,
+            "titles": self._titles,
+            "columns": {
+                name: base64.b64encode(column.tobytes()).decode()
+                for name, column in self._columns.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CompletionHistory:
+        """Rebuild a history, and its indexes, from as_dict() output."""
+        history = cls()
+        history._titles = list(data.get("titles", []))
+        history._title_ids = {title: i for i, title in enumerate(history._titles)}
+        history._indexes = {i: _RoutineIndex() for i in range(len(history._titles))}
+
+        columns = {}
+        for name, code in _COLUMNS.items():
+            column = array(code)
+            column.frombytes(base64.b64decode(data["columns"][name]))
+            if data.get("byteorder", sys.byteorder) != sys.byteorder:
+                column.byteswap()
+            columns[name] = column
+
+        for row in zip(
+            columns["kinds"],
+            columns["routines"],
+            columns["tasks"],
+            columns["timestamps"],
+            columns["days"],
+            columns["durations"],
+        ):
+            history._append_row(*row)
+
+        return history
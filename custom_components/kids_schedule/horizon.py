@@ -0,0 +1,151 @@
+"""Sliding window of per-day calendar buckets for Kids Schedule."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import hashlib
+from typing import Any, NamedTuple
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+
+class DayBucket(NamedTuple):
+    """Events of one local day and a fingerprint of them."""
+
+    events: list[dict[str, Any]]
+    fingerprint: str
+
+
+def _fingerprint(events: list[dict[str, Any]]) -> str:
+    """Return a fingerprint of a day's events."""
+    return hashlib.sha1(json_bytes(events)).hexdigest()
+
+
+def event_time(value: str) -> datetime | None:
+    """Return an event's start or end as an aware datetime.
+
+    All-day events only carry a date, which becomes the start of that local
+    day; times without a zone are taken as local.
+    """
+    if (parsed := dt_util.parse_datetime(value)) is None:
+        if (day := dt_util.parse_date(value)) is None:
+            return None
+        return dt_util.start_of_local_day(day)
+    if parsed.tzinfo is None:
+        # A bare date parses as naive midnight
+        return parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed
+
+
+def event_day(event: dict[str, Any], window_start: date) -> date | None:
+    """Return the day an event is filed under.
+
+    Events are filed under their local start date; events that started
+    before the window (and are still running) are filed under its first day.
+    """
+    if (start := event_time(event.get("start", ""))) is None:
+        return None
+    return max(dt_util.as_local(start).date(), window_start)
+
+
+class CalendarHorizon:
+    """Per-day buckets covering today and the following days.
+
+    At rollover the expired days are dropped and only days that entered the
+    window need fetching. Every day in the window has a bucket once fetched,
+    even when it has no events.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty horizon."""
+        self.buckets: dict[date, DayBucket] = {}
+        self._fingerprint: str | None = None
+
+    def roll(self, today: date, days: int) -> list[tuple[date, date]]:
+        """Drop days outside [today, today + days) and return missing ranges.
+
+        Ranges are half-open (start, end) date pairs of consecutive days.
+        """
+        end = today + timedelta(days=days)
+        for day in [day for day in self.buckets if not today <= day < end]:
+            del self.buckets[day]
+            self._fingerprint = None
+
+        ranges: list[tuple[date, date]] = []
+        day = today
+        while day < end:
+            if day in self.buckets:
+                day += timedelta(days=1)
+                continue
+            range_start = day
+            while day < end and day not in self.buckets:
+                day += timedelta(days=1)
+            ranges.append((range_start, day))
+        return ranges
+
+    def store(
+        self,
+        window_start: date,
+        start: date,
+        end: date,
+        events: list[dict[str, Any]],
+    ) -> None:
+        """Replace the buckets of [start, end) with freshly fetched events.
+
+        Events filed under a day before start (running since an earlier
+        day already in the window) are left to that day's bucket.
+        """
+        by_day: dict[date, list[dict[str, Any]]] = {}
+        for event in events:
+            day = event_day(event, window_start)
+            if day is not None and start <= day < end:
+                by_day.setdefault(day, []).append(event)
+
+        day = start
+        while day < end:
+            day_events = by_day.get(day, [])
+            fingerprint = _fingerprint(day_events)
+            current = self.buckets.get(day)
+            if current is None or current.fingerprint != fingerprint:
+                self.buckets[day] = DayBucket(day_events, fingerprint)
+                self._fingerprint = None
+            day += timedelta(days=1)
+
+        # Keep the buckets in date order
+        if list(self.buckets) != sorted(self.buckets):
+            self.buckets = dict(sorted(self.buckets.items()))
+
+    @property
+    def fingerprint(self) -> str:
+        """Return a fingerprint of the whole window."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for day, bucket in self.buckets.items():
+                digest.update(day.isoformat().encode())
+                digest.update(bucket.fingerprint.encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def as_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the events of every day, keyed by ISO date."""
+        return {day.isoformat(): bucket.events for day, bucket in self.buckets.items()}
+
+    def restore(self, days: dict[str, list[dict[str, Any]]]) -> None:
+        """Replace all buckets with days returned by as_dict.
+
+        Raises ValueError if a day cannot be read.
+        """
+        buckets = {}
+        for day_key, events in days.items():
+            if (day := dt_util.parse_date(day_key)) is None:
+                raise ValueError(f"invalid day {day_key!r}")
+            if not isinstance(events, list):
+                raise ValueError(f"invalid events of {day_key}")
+            buckets[day] = DayBucket(events, _fingerprint(events))
+        self.buckets = dict(sorted(buckets.items()))
+        self._fingerprint = None
+
+    def clear(self) -> None:
+        """Forget all buckets."""
+        self.buckets.clear()
+        self._fingerprint = None
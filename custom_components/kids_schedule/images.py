@@ -0,0 +1,349 @@
+"""Task image proxy with an on-disk thumbnail cache for Kids Schedule."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http import HTTPStatus
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+from pathlib import Path
+import re
+import time
+
+from aiohttp import ClientTimeout, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DATA_IMAGE_PROXY,
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_RETENTION_DAYS,
+    IMAGE_FETCH_TIMEOUT,
+    IMAGE_MAX_BYTES,
+    IMAGE_REVALIDATE_INTERVAL,
+    IMAGE_SIZES,
+    IMAGE_DEFAULT_SIZE,
+)
+from .metrics import Metrics
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails need Pillow; without it originals are served
+    Image = None
+
+_LOGGER = logging.getLogger(__name__)
+
+IMAGE_URL = "/api/kids_schedule/image"
+# <sha256 of the original>[_<size>].<extension>
+_FILE_NAME = re.compile(
+    r"^(?P<digest>[0-9a-f]{64})(?:_(?P<size>\d+))?\.(?P<ext>[a-z]+)$"
+)
+_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+_CONTENT_TYPES = {ext: content_type for content_type, ext in _EXTENSIONS.items()}
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@callback
+def async_get_image_proxy(hass: HomeAssistant) -> ImageProxy:
+    """Return the shared image proxy, creating it on first use.
+
+    The proxy outlives its entries: its view cannot be unregistered.
+    """
+    if (proxy := hass.data.get(DATA_IMAGE_PROXY)) is None:
+        proxy = hass.data[DATA_IMAGE_PROXY] = ImageProxy(
+            hass, Path(hass.config.path(IMAGE_CACHE_DIR))
+        )
+    return proxy
+
+
+@callback
+def async_register_image_view(hass: HomeAssistant) -> None:
+    """Serve the cached images, once."""
+    proxy = async_get_image_proxy(hass)
+    if not proxy.view_registered:
+        proxy.view_registered = True
+        hass.http.register_view(KidsScheduleImageView(proxy))
+
+
+@dataclass
+class _Resolved:
+    """A source image stored in the cache."""
+
+    digest: str
+    ext: str
+    # Extension of the thumbnails, None if the original is served at all sizes
+    thumb_ext: str | None
+    checked: float
+
+
+class ImageProxy:
+    """Store task images by content hash and serve resized copies.
+
+    Only images named in task descriptions are ever fetched. Each is stored
+    once under the SHA-256 of its bytes, so its URL changes exactly when its
+    content does and clients may cache it forever. Sources are fetched again
+    at most once per revalidation interval.
+    """
+
+    def __init__(self, hass: HomeAssistant, cache_dir: Path) -> None:
+        """Initialize the proxy."""
+        self.hass = hass
+        self.cache_dir = cache_dir
+        # Bumped whenever a source gets a new URL
+        self.version = 0
+        self._resolved: dict[str, _Resolved] = {}
+        # Source -> when it last failed, retried after the same interval
+        self._failed: dict[str, float] = {}
+        self._in_flight: dict[str, asyncio.Task[bool]] = {}
+        self._pruned = False
+        self._warned_no_pillow = False
+        self.view_registered = False
+
+    def url(self, source: str, size: int = IMAGE_DEFAULT_SIZE) -> str | None:
+        """Return the proxied URL of a source, or None if it is not cached."""
+        if (resolved := self._resolved.get(source)) is None:
+            return None
+        if resolved.thumb_ext is None:
+            return f"{IMAGE_URL}/{resolved.digest}.{resolved.ext}"
+        return f"{IMAGE_URL}/{resolved.digest}_{size}.{resolved.thumb_ext}"
+
+    async def async_warm(
+        self, sources: Iterable[str], metrics: Metrics, *, remote: bool = False
+    ) -> bool:
+        """Cache new sources and revalidate stale ones.
+
+        Only /local/ sources are fetched, and http(s) ones too if remote is
+        set: anyone who can edit the calendar picks the URLs, which Home
+        Assistant would otherwise fetch from inside the network. Returns True
+        if any source got a new URL.
+        """
+        if not self._pruned:
+            self._pruned = True
+            await self.hass.async_add_executor_job(self._prune)
+
+        now = time.monotonic()
+        tasks = []
+        for source in set(sources):
+            if not _is_proxied(source, remote):
+                continue
+            resolved = self._resolved.get(source)
+            checked = resolved.checked if resolved else self._failed.get(source)
+            if checked is not None and now - checked < IMAGE_REVALIDATE_INTERVAL:
+                continue
+            if (task := self._in_flight.get(source)) is None:
+                task = self._in_flight[source] = self.hass.async_create_task(
+                    self._async_resolve(source, metrics)
+                )
+                task.add_done_callback(
+                    lambda _, source=source: self._in_flight.pop(source, None)
+                )
+            tasks.append(task)
+
+        if not tasks:
+            return False
+        with metrics.timer("images.warm"):
+            changed = any(await asyncio.gather(*tasks))
+        if changed:
+            self.version += 1
+        return changed
+
+    async def _async_resolve(self, source: str, metrics: Metrics) -> bool:
+        """Fetch a source and store it. Returns True if its URL changed."""
+        previous = self._resolved.get(source)
+        try:
+            content, content_type = await self._async_fetch(source)
+            resolved = await self.hass.async_add_executor_job(
+                self._store, content, content_type
+            )
+        except Exception as err:
+            metrics.increment("image_errors")
+            _LOGGER.warning("Error caching task image %s: %s", source, err)
+            # Keep serving what we have, and retry after the interval
+            if previous is not None:
+                previous.checked = time.monotonic()
+            else:
+                self._failed[source] = time.monotonic()
+            return False
+
+        metrics.increment("images_fetched")
+        self._failed.pop(source, None)
+        self._resolved[source] = resolved
+        return previous is None or previous.digest != resolved.digest
+
+    async def _async_fetch(self, source: str) -> tuple[bytes, str]:
+        """Return the bytes and content type of a source."""
+        if source.startswith("/local/"):
+            return await self.hass.async_add_executor_job(self._read_local, source)
+
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            source, timeout=ClientTimeout(total=IMAGE_FETCH_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            content = await response.content.read(IMAGE_MAX_BYTES + 1)
+            if len(content) > IMAGE_MAX_BYTES:
+                raise ValueError(f"larger than {IMAGE_MAX_BYTES} bytes")
+            return content, response.content_type
+
+    def _read_local(self, source: str) -> tuple[bytes, str]:
+        """Read a /local/ image from the www folder."""
+        www = Path(self.hass.config.path("www")).resolve()
+        path = (www / source.removeprefix("/local/")).resolve()
+        if not path.is_relative_to(www):
+            raise ValueError("outside the www folder")
+        if path.stat().st_size > IMAGE_MAX_BYTES:
+            raise ValueError(f"larger than {IMAGE_MAX_BYTES} bytes")
+        content_type, _ = mimetypes.guess_type(path.name)
+        return path.read_bytes(), content_type or ""
+
+    def _store(self, content: bytes, content_type: str) -> _Resolved:
+        """Write an original and its thumbnails to the cache."""
+        if (ext := _EXTENSIONS.get(content_type)) is None:
+            raise ValueError(f"unsupported content type {content_type!r}")
+        digest = hashlib.sha256(content).hexdigest()
+        folder = self.cache_dir / digest[:2]
+        folder.mkdir(parents=True, exist_ok=True)
+
+        original = folder / f"{digest}.{ext}"
+        if not original.exists():
+            _write_atomic(original, content)
+        else:
+            # Marks the image as in use for pruning
+            os.utime(original)
+
+        thumb_ext = None
+        # Animations would lose their frames
+        if Image is not None and ext != "gif":
+            thumb_ext = self._make_thumbnails(folder, digest, content)
+        elif Image is None and not self._warned_no_pillow:
+            self._warned_no_pillow = True
+            _LOGGER.warning(
+                "Pillow is not installed, so task images are served at full size"
+            )
+        return _Resolved(digest, ext, thumb_ext, time.monotonic())
+
+    def _make_thumbnails(self, folder: Path, digest: str, content: bytes) -> str:
+        """Write one thumbnail per size and return their extension."""
+        with Image.open(io.BytesIO(content)) as image:
+            image.load()
+            # Keep transparency in PNG, everything else becomes JPEG
+            has_alpha = image.mode in ("RGBA", "LA", "P")
+            thumb_ext = "png" if has_alpha else "jpg"
+            converted = image.convert("RGBA" if has_alpha else "RGB")
+            for size in IMAGE_SIZES:
+                path = folder / f"{digest}_{size}.{thumb_ext}"
+                if path.exists():
+                    continue
+                thumb = converted.copy()
+                thumb.thumbnail((size, size))
+                buffer = io.BytesIO()
+                if has_alpha:
+                    thumb.save(buffer, "PNG", optimize=True)
+                else:
+                    thumb.save(buffer, "JPEG", quality=85, optimize=True)
+                _write_atomic(path, buffer.getvalue())
+        return thumb_ext
+
+    def _prune(self) -> None:
+        """Remove images that have not been used for the retention period."""
+        if not self.cache_dir.is_dir():
+            return
+        cutoff = time.time() - IMAGE_CACHE_RETENTION_DAYS * 86400
+        for folder in self.cache_dir.iterdir():
+            if not folder.is_dir():
+                continue
+            originals = [
+                path
+                for path in folder.iterdir()
+                if (match := _FILE_NAME.match(path.name)) and not match["size"]
+            ]
+            for original in originals:
+                if original.stat().st_mtime >= cutoff:
+                    continue
+                digest = original.name.split(".")[0]
+                for path in folder.glob(f"{digest}*"):
+                    path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics."""
+        return {
+            "cached": len(self._resolved),
+            "failed": len(self._failed),
+            "version": self.version,
+        }
+
+    def read(self, file_name: str) -> tuple[bytes, str] | None:
+        """Return the bytes and content type of a cached file, if it exists."""
+        if (match := _FILE_NAME.match(file_name)) is None:
+            return None
+        if match["ext"] not in _CONTENT_TYPES:
+            return None
+        if match["size"] and int(match["size"]) not in IMAGE_SIZES:
+            return None
+        path = self.cache_dir / match["digest"][:2] / file_name
+        try:
+            return path.read_bytes(), _CONTENT_TYPES[match["ext"]]
+        except FileNotFoundError:
+            return None
+
+
+def _is_proxied(source: object, remote: bool) -> bool:
+    """Return True for sources the proxy may fetch."""
+    if not isinstance(source, str):
+        return False
+    if remote:
+        return source.startswith(("/local/", "http://", "https://"))
+    return source.startswith("/local/")
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Write a file so readers never see it half written."""
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.write_bytes(content)
+    temp.replace(path)
+
+
+class KidsScheduleImageView(HomeAssistantView):
+    """Serve cached task images.
+
+    Like /local/, no authentication is needed: the card loads these with
+    plain <img> tags, and only images from task descriptions are cached,
+    under names derived from their content.
+    """
+
+    url = f"{IMAGE_URL}/{{file_name}}"
+    name = "api:kids_schedule:image"
+    requires_auth = False
+
+    def __init__(self, proxy: ImageProxy) -> None:
+        """Initialize the view."""
+        self._proxy = proxy
+
+    async def get(self, request: web.Request, file_name: str) -> web.Response:
+        """Return a cached image, or 304 if the client already has it."""
+        # The name is derived from the content, so it is a strong validator
+        etag = f'"{file_name}"'
+        headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        cached = await self._proxy.hass.async_add_executor_job(
+            self._proxy.read, file_name
+        )
+        if cached is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        content, content_type = cached
+        return web.Response(body=content, content_type=content_type, headers=headers)
@@ -0,0 +1,50 @@
+"""Sorted interval index over routine times for Kids Schedule."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+import itertools
+from typing import Any
+
+
+class IntervalIndex:
+    """Routines sorted by start time, for bisect lookups by time.
+
+    Next to the start times it keeps the running maximum of end times, so
+    the routines that ended before a given time form a prefix that one
+    bisect skips. Finding the active routines then only visits routines
+    that started before the time and after the first one still running.
+    """
+
+    def __init__(self, routines: Iterable[dict[str, Any]]) -> None:
+        """Index routines by their start and end times."""
+        self._routines = sorted(
+            routines, key=lambda routine: (routine["start_time"], routine["id"])
+        )
+        self._starts = [routine["start_time"] for routine in self._routines]
+        self._max_ends = list(
+            itertools.accumulate(
+                (routine["end_time"] for routine in self._routines), max
+            )
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed routines."""
+        return len(self._routines)
+
+    def active(self, now: datetime) -> list[dict[str, Any]]:
+        """Return every routine running at now, by start time."""
+        started = bisect_right(self._starts, now)
+        # Every routine before the first running maximum has ended
+        first = bisect_right(self._max_ends, now, hi=started)
+        return [
+            routine
+            for routine in self._routines[first:started]
+            if now < routine["end_time"]
+        ]
+
+    def next(self, now: datetime) -> dict[str, Any] | None:
+        """Return the first routine starting after now."""
+        index = bisect_right(self._starts, now)
+        return self._routines[index] if index < len(self._routines) else None
@@ -0,0 +1,94 @@
+"""Lightweight runtime metrics for Kids Schedule."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded
+HISTOGRAM_BUCKETS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in milliseconds."""
+
+    __slots__ = ("buckets", "count", "total", "max", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one duration."""
+        self.buckets[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable summary."""
+        labels = [f"<={bound:g}" for bound in HISTOGRAM_BUCKETS]
+        labels.append(f">{HISTOGRAM_BUCKETS[-1]:g}")
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else None,
+            "max_ms": round(self.max, 3),
+            "last_ms": round(self.last, 3),
+            "buckets": {
+                label: count for label, count in zip(labels, self.buckets) if count
+            },
+        }
+
+
+class Metrics:
+    """Counters and timing histograms for one config entry."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        # Bumped on every change so readers can tell when to re-render
+        self.version = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        self.version += 1
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a duration (ms) in a histogram."""
+        if (histogram := self.histograms.get(name)) is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+        self.version += 1
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block, including when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def last(self, name: str) -> float | None:
+        """Return the latest duration recorded in a histogram."""
+        histogram = self.histograms.get(name)
+        return round(histogram.last, 3) if histogram else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable snapshot."""
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timings": {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
@@ -0,0 +1,97 @@
+"""Serialized, group-committed state mutations for Kids Schedule."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .metrics import Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+Mutation = Callable[[], Any]
+
+
+class MutationQueue:
+    """Apply mutations one at a time and acknowledge them once published.
+
+    Mutations are synchronous callables run in submission order by a single
+    worker. Everything submitted in the same event loop iteration forms a
+    batch, so under load many mutations share one commit. The commit
+    callback publishes the batch and schedules its write; it does not wait
+    for the write. A caller's await returns the mutation's result after the
+    commit that includes it; if the mutation raises, only its caller gets
+    the error, and if the commit fails, every caller of that batch does.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        commit: Callable[[], None],
+        metrics: Metrics,
+        name: str,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._commit = commit
+        self._metrics = metrics
+        self._name = name
+        self._pending: list[tuple[Mutation, asyncio.Future[Any]]] = []
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of mutations waiting for the next batch."""
+        return len(self._pending)
+
+    async def async_submit(self, mutation: Mutation) -> Any:
+        """Queue a mutation and return its result once it is committed."""
+        future: asyncio.Future[Any] = self.hass.loop.create_future()
+        self._pending.append((mutation, future))
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_background_task(
+                self._async_run(), self._name
+            )
+        return await future
+
+    async def _async_run(self) -> None:
+        """Apply and commit batches until the queue is empty."""
+        while self._pending:
+            batch, self._pending = self._pending, []
+            self._metrics.increment("mutation_batches")
+            self._metrics.increment("mutations", len(batch))
+
+            applied: list[tuple[asyncio.Future[Any], Any]] = []
+            for mutation, future in batch:
+                try:
+                    result = mutation()
+                except Exception as err:  # Reported to the caller only
+                    if not future.done():
+                        future.set_exception(err)
+                    continue
+                applied.append((future, result))
+
+            try:
+                with self._metrics.timer("mutation_commit"):
+                    self._commit()
+            except Exception as err:
+                _LOGGER.error("Error publishing Kids Schedule state: %s", err)
+                for future, _ in applied:
+                    if not future.done():
+                        future.set_exception(err)
+            else:
+                for future, result in applied:
+                    # The caller may have been cancelled meanwhile
+                    if not future.done():
+                        future.set_result(result)
+
+            # Mutations submitted meanwhile form the next batch
+            await asyncio.sleep(0)
+
+    async def async_stop(self) -> None:
+        """Wait for queued mutations to be committed."""
+        if self._worker is not None and not self._worker.done():
+            await self._worker
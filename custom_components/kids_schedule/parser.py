@@ -0,0 +1,338 @@
+"""Task description parsing for Kids Schedule."""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+import re
+from typing import Any, NamedTuple
+
+import yaml
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_TASK_DURATION = 5
+
+
+class TaskTemplate(NamedTuple):
+    """Immutable task definition parsed from an event description."""
+
+    title: str
+    image: str | None
+    duration: int
+
+    def as_task(self, completed: bool = False) -> dict[str, Any]:
+        """Return a task dict with completion state."""
+        return {
+            "title": self.title,
+            "image": self.image,
+            "duration": self.duration,
+            "completed": completed,
+        }
+
+
+class TaskParseError(ValueError):
+    """A task description that cannot be parsed."""
+
+    def __init__(self, line: int, message: str) -> None:
+        """Initialize the error for a 1-based line of the description."""
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+class _OutsideSubset(Exception):
+    """The description uses YAML the scanner does not handle."""
+
+
+# Plain scalars starting with these need the full YAML parser
+_INDICATORS = frozenset("[]{},&*!|>%@`?")
+# The types YAML gives plain scalars, as the safe loader resolves them
+_RESOLVER = Resolver()
+_TAG_STR = "tag:yaml.org,2002:str"
+_TAG_NULL = "tag:yaml.org,2002:null"
+_TAG_INT = "tag:yaml.org,2002:int"
+# Ints the scanner reads itself; octal, hex, signs and _ are left to YAML
+_DECIMAL = re.compile(r"(?:0|[1-9][0-9]*)\Z")
+
+
+def parse_task_templates(description: str) -> tuple[TaskTemplate, ...]:
+    """Parse tasks from event description (YAML or simple list).
+
+    The documented formats are read in a single pass over the lines; only
+    YAML outside that subset goes through the full YAML parser.
+    """
+    lines = description.splitlines()
+    if "tasks:" not in description:
+        return _parse_simple_list(lines)
+
+    try:
+        try:
+            return _scan_tasks(lines)
+        except _OutsideSubset:
+            return _parse_yaml(description)
+    except Exception as err:
+        _LOGGER.warning("Error parsing tasks from description: %s", err)
+    return ()
+
+
+def _parse_simple_list(lines: list[str]) -> tuple[TaskTemplate, ...]:
+    """Parse lines starting with - or numbers, skipping anything else."""
+    tasks: list[TaskTemplate] = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith("-") or line[:1].isdigit():
+            title = line.lstrip("-0123456789.").strip()
+            if title:
+                tasks.append(TaskTemplate(title, None, DEFAULT_TASK_DURATION))
+    return tuple(tasks)
+
+
+def _scan_tasks(lines: list[str]) -> tuple[TaskTemplate, ...]:
+    """Read a top-level tasks list in one pass.
+
+    Handles block list items that are a scalar or a mapping with title,
+    image and duration; single-line plain or quoted scalars; comments and
+    blank lines. Raises _OutsideSubset for anything else, so the result is
+    always what _parse_yaml would return.
+    """
+    tasks: list[TaskTemplate] = []
+    found = False
+    in_tasks = False
+    list_indent = -1
+    # Keys and values of the mapping item being read
+    item: dict[str, Any] | None = None
+    key_indent = -1
+
+    for number, line in enumerate(lines, 1):
+        text = line.lstrip(" ")
+        stripped = text.rstrip()
+        if not stripped or stripped[0] == "#":
+            continue
+        if text[0] == "\t":
+            raise _OutsideSubset
+        indent = len(line) - len(text)
+        is_item = stripped == "-" or stripped.startswith("- ")
+
+        if indent == 0 and not is_item:
+            if (entry := _split_key(stripped)) is None:
+                raise _OutsideSubset
+            key, value = entry
+            if item:
+                tasks.append(_template(item))
+            item = None
+            in_tasks = key == "tasks"
+            if not in_tasks:
+                # Other top-level keys are ignored, if they hold a scalar
+                _scalar(value)
+                continue
+            if found:
+                raise _OutsideSubset
+            found = True
+            if _scalar(value) is not None:
+                raise TaskParseError(number, "tasks must be a list of '- ' items")
+            continue
+
+        if not in_tasks:
+            raise _OutsideSubset
+
+        if is_item:
+            if list_indent == -1:
+                list_indent = indent
+            elif indent != list_indent:
+                raise _OutsideSubset
+            if item:
+                tasks.append(_template(item))
+            item = None
+
+            rest = stripped[1:].lstrip(" ")
+            if not rest or rest[0] == "#":
+                # The item's keys start on the next line; without any, it
+                # is null and skipped
+                item = {}
+                key_indent = -1
+                continue
+            if rest == "-" or rest.startswith("- "):
+                raise _OutsideSubset
+            if (entry := _split_key(rest)) is None:
+                # Like the YAML parser, skip items that are not strings
+                if isinstance(title := _scalar(rest), str):
+                    tasks.append(TaskTemplate(title, None, DEFAULT_TASK_DURATION))
+                continue
+            item = {}
+            key_indent = indent + len(stripped) - len(rest)
+        else:
+            # Another key of the current mapping item
+            if item is None:
+                if list_indent == -1:
+                    raise TaskParseError(
+                        number, "expected a '- ' list item under tasks"
+                    )
+                raise _OutsideSubset
+            if key_indent == -1:
+                if indent <= list_indent:
+                    raise _OutsideSubset
+                key_indent = indent
+            elif indent != key_indent:
+                raise _OutsideSubset
+            if (entry := _split_key(stripped)) is None:
+                raise _OutsideSubset
+
+        key, value = entry
+        item[key] = _scalar(value)
+
+    if not found:
+        raise _OutsideSubset
+    if item:
+        tasks.append(_template(item))
+    return tuple(tasks)
+
+
+def _split_key(text: str) -> tuple[str, str] | None:
+    """Split a "key: value" line, or return None if it is not one."""
+    if text[0] in _INDICATORS or text[0] in "'\"":
+        return None
+    comment = text.find(" #")
+    content = text if comment == -1 else text[:comment]
+    colon = content.find(": ")
+    if colon == -1:
+        if not content.endswith(":"):
+            return None
+        return content[:-1].rstrip(), ""
+    return content[:colon].rstrip(), text[colon + 2 :].strip()
+
+
+def _scalar(text: str) -> str | int | None:
+    """Return the value of a single-line scalar, typed as YAML would."""
+    if not text or text[0] == "#":
+        return None
+
+    quote = text[0]
+    if quote == "'":
+        # Single quotes escape themselves by doubling
+        parts = []
+        start = 1
+        while True:
+            close = text.find("'", start)
+            if close == -1:
+                raise _OutsideSubset
+            parts.append(text[start:close])
+            if text[close + 1 : close + 2] != "'":
+                break
+            parts.append("'")
+            start = close + 2
+        value = "".join(parts)
+    elif quote == '"':
+        close = text.find('"', 1)
+        if close == -1 or "\\" in text[:close]:
+            raise _OutsideSubset
+        value = text[1:close]
+    else:
+        if quote in _INDICATORS:
+            raise _OutsideSubset
+        comment = text.find(" #")
+        if comment != -1:
+            text = text[:comment].rstrip()
+        return _plain(text)
+
+    rest = text[close + 1 :]
+    if rest and not (rest[0] == " " and rest.lstrip(" ")[:1] == "#"):
+        raise _OutsideSubset
+    return value
+
+
+def _plain(text: str) -> str | int | None:
+    """Resolve a plain scalar to a string, a decimal int or None."""
+    if (
+        "\t" in text
+        or ": " in text
+        or text.endswith(":")
+        or text in ("-", "?", ":")
+        or text.startswith(("- ", "? ", ": "))
+    ):
+        # Invalid, or a nested collection, in block context
+        raise _OutsideSubset
+    tag = _RESOLVER.resolve(ScalarNode, text, (True, False))
+    if tag == _TAG_STR:
+        return text
+    if tag == _TAG_NULL:
+        return None
+    if tag == _TAG_INT and text.isascii() and _DECIMAL.match(text):
+        return int(text)
+    # Floats, booleans, dates and other int forms
+    raise _OutsideSubset
+
+
+def _template(item: dict[str, Any]) -> TaskTemplate:
+    """Build a task from the fields of a mapping item, as _parse_yaml does."""
+    return TaskTemplate(
+        item.get("title", "Task"),
+        item.get("image"),
+        item.get("duration", DEFAULT_TASK_DURATION),
+    )
+
+
+def _parse_yaml(description: str) -> tuple[TaskTemplate, ...]:
+    """Parse a YAML description with the full YAML parser."""
+    tasks: list[TaskTemplate] = []
+    data = yaml.safe_load(description)
+    if isinstance(data, dict) and isinstance(data.get("tasks"), list):
+        for task in data["tasks"]:
+            if isinstance(task, dict):
+                tasks.append(
+                    TaskTemplate(
+                        task.get("title", "Task"),
+                        task.get("image"),
+                        task.get("duration", DEFAULT_TASK_DURATION),
+                    )
+                )
+            elif isinstance(task, str):
+                tasks.append(TaskTemplate(task, None, DEFAULT_TASK_DURATION))
+    return tuple(tasks)
+
+
+class TaskTemplateCache:
+    """Bounded LRU cache of parsed task templates keyed by description hash."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, tuple[TaskTemplate, ...]] = OrderedDict()
+
+    def get(self, description: str) -> tuple[TaskTemplate, ...]:
+        """Return the parsed templates for a description, parsing on a miss."""
+        key = hashlib.sha1(description.encode()).digest()
+
+        templates = self._entries.get(key)
+        if templates is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return templates
+
+        self.misses += 1
+        templates = parse_task_templates(description)
+        self._entries[key] = templates
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return templates
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
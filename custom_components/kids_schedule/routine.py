@@ -0,0 +1,77 @@
+"""Task completion helpers for Kids Schedule routines.
+
+A routine's tasks are a tuple of shared, immutable TaskTemplate objects and
+its completion is an integer bitmask, bit i set when task i is done. The
+routine dict keeps "completed_count" in step with the mask.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from .parser import TaskTemplate
+
+
+def full_mask(total: int) -> int:
+    """Return the mask with all of a routine's tasks completed."""
+    return (1 << total) - 1
+
+
+def is_completed(routine: dict[str, Any], task_index: int) -> bool:
+    """Return True if a task of the routine is completed."""
+    return bool(routine["completed_mask"] >> task_index & 1)
+
+
+def set_completed(routine: dict[str, Any], task_index: int, completed: bool) -> bool:
+    """Set a task's completion. Returns False if it already had that state."""
+    mask = routine["completed_mask"]
+    bit = 1 << task_index
+    new_mask = mask | bit if completed else mask & ~bit
+    if new_mask == mask:
+        return False
+    set_mask(routine, new_mask)
+    return True
+
+
+def set_mask(routine: dict[str, Any], mask: int) -> None:
+    """Replace a routine's completion, ignoring bits beyond its tasks."""
+    mask &= full_mask(routine["total_count"])
+    routine["completed_mask"] = mask
+    routine["completed_count"] = mask.bit_count()
+
+
+def first_incomplete(routine: dict[str, Any]) -> int | None:
+    """Return the index of the first task not completed, if any."""
+    mask = routine["completed_mask"]
+    # Adding one carries through the trailing ones into the lowest clear bit
+    index = ((mask + 1) & ~mask).bit_length() - 1
+    return index if index < routine["total_count"] else None
+
+
+def task_dicts(
+    routine: dict[str, Any],
+    image_url: Callable[[str], str | None] | None = None,
+) -> list[dict[str, Any]]:
+    """Return the routine's tasks as dicts with their completion.
+
+    If given, image_url maps an image to the URL to show instead, or None
+    to keep it.
+    """
+    mask = routine["completed_mask"]
+    tasks = []
+    for index, template in enumerate(routine["tasks"]):
+        task = template.as_task(bool(mask >> index & 1))
+        if image_url is not None and template.image:
+            task["image"] = image_url(template.image) or template.image
+        tasks.append(task)
+    return tasks
+
+
+def new_routine_tasks(templates: tuple[TaskTemplate, ...]) -> dict[str, Any]:
+    """Return the task fields of a routine with nothing completed."""
+    return {
+        "tasks": templates,
+        "completed_mask": 0,
+        "completed_count": 0,
+        "total_count": len(templates),
+    }
@@ -1,17 +1,38 @@
 """Sensor platform for Kids Schedule."""
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, ATTR_TASKS, ATTR_COMPLETED_TASKS, ATTR_TOTAL_TASKS, ATTR_PROGRESS
+from .const import (
+    DOMAIN,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_DEBUG_SENSOR,
+    DEFAULT_COMPACT_ATTRIBUTES,
+    DEFAULT_DEBUG_SENSOR,
+    ATTRIBUTE_SIZE_BUDGET,
+    ATTR_TASKS,
+    ATTR_COMPLETED_TASKS,
+    ATTR_TOTAL_TASKS,
+    ATTR_PROGRESS,
+    ATTR_CURRENT_TASK,
+    ATTR_STALE,
+)
 from .coordinator import KidsScheduleCoordinator
+from .routine import first_incomplete, task_dicts
 
 
 async def async_setup_entry(
@@ -27,12 +48,49 @@ async def async_setup_entry(
         KidsScheduleWeeklySensor(coordinator, config_entry),
         KidsScheduleCurrentRoutineSensor(coordinator, config_entry),
     ]
+    if coordinator.get_option(CONF_DEBUG_SENSOR, DEFAULT_DEBUG_SENSOR):
+        sensors.append(KidsScheduleDebugSensor(coordinator, config_entry))
 
     async_add_entities(sensors)
 
 
-class KidsScheduleDailySensor(CoordinatorEntity, SensorEntity):
-    """Sensor for daily schedule."""
+def _progress(completed: int, total: int) -> int:
+    """Return completion as a rounded percentage."""
+    return round((completed / total) * 100) if total > 0 else 0
+
+
+def _completion(routine: dict[str, Any] | None) -> int | None:
+    """Return the completion bitmask of a routine's tasks."""
+    if not routine:
+        return None
+    return routine["completed_mask"]
+
+
+def _routine_view(
+    routine: dict[str, Any] | None, image_url: Callable[[str], str | None]
+) -> dict[str, Any] | None:
+    """Return a routine with its tasks as dicts, as the card expects."""
+    if not routine:
+        return None
+    view = {key: value for key, value in routine.items() if key != "completed_mask"}
+    view[ATTR_TASKS] = task_dicts(routine, image_url)
+    return view
+
+
+def _routine_summary(routine: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Return the small, task-free view of a routine."""
+    if not routine:
+        return None
+    return {
+        "id": routine["id"],
+        "title": routine["title"],
+        "start_time": routine["start_time"].isoformat(),
+        "end_time": routine["end_time"].isoformat(),
+    }
+
+
+class KidsScheduleSensor(CoordinatorEntity, SensorEntity):
+    """Base class for Kids Schedule sensors."""
 
     def __init__(
         self, coordinator: KidsScheduleCoordinator, config_entry: ConfigEntry
@@ -40,6 +98,65 @@ class KidsScheduleDailySensor(CoordinatorEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._config_entry = config_entry
+        self._fingerprint: tuple[Any, ...] | None = None
+        self._attributes_cache: tuple[int, dict[str, Any] | None] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the sensor's content fingerprint changes."""
+        fingerprint = (
+            self.coordinator.last_update_success,
+            self._get_fingerprint(),
+        )
+        if fingerprint == self._fingerprint:
+            return
+
+        self._fingerprint = fingerprint
+        super()._handle_coordinator_update()
+
+    def _get_fingerprint(self) -> tuple[Any, ...]:
+        """Return a cheap value that changes whenever the state would."""
+        raise NotImplementedError
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional state attributes, built once per data generation."""
+        generation = self.coordinator.data_generation
+        if self._attributes_cache is None or self._attributes_cache[0] != generation:
+            self._attributes_cache = (generation, self._build_attributes())
+        return self._attributes_cache[1]
+
+    def _build_attributes(self) -> dict[str, Any] | None:
+        """Build the state attributes."""
+        raise NotImplementedError
+
+    @property
+    def compact_attributes(self) -> bool:
+        """Return True if only summary attributes should be exposed."""
+        return self._config_entry.options.get(
+            CONF_COMPACT_ATTRIBUTES,
+            self._config_entry.data.get(
+                CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+            ),
+        )
+
+    @staticmethod
+    def _within_budget(attributes: dict[str, Any]) -> bool:
+        """Return True if the attributes fit in the size budget."""
+        return len(json_bytes(attributes)) <= ATTRIBUTE_SIZE_BUDGET
+
+
+class KidsScheduleDailySensor(KidsScheduleSensor):
+    """Sensor for daily schedule."""
+
+    # The summary fields carry the history; the bulky lists are not recorded
+    _unrecorded_attributes = frozenset({"routines", "current_routine", "next_routine"})
+
+    def __init__(
+        self, coordinator: KidsScheduleCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
         self._attr_name = f"{config_entry.title} Daily"
         self._attr_unique_id = f"{config_entry.entry_id}_daily"
         self._attr_icon = "mdi:calendar-today"
@@ -49,14 +166,42 @@ class KidsScheduleDailySensor(CoordinatorEntity, SensorEntity):
         """Return the number of routines today."""
         return len(self.coordinator.data.get("daily", {}))
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
+    def _get_fingerprint(self) -> tuple[Any, ...]:
+        """Return the calendar fingerprint plus live routine state."""
+        data = self.coordinator.data
+        return (
+            self.coordinator.events_fingerprint,
+            self.coordinator.stale,
+            self.coordinator.images.version,
+            tuple(
+                (routine_id, routine["is_current"], _completion(routine))
+                for routine_id, routine in data.get("daily", {}).items()
+            ),
+            (data.get("current_routine") or {}).get("id"),
+            (data.get("next_routine") or {}).get("id"),
+        )
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes."""
         daily_data = self.coordinator.data.get("daily", {})
-        
-        routines_list = []
-        for routine in daily_data.values():
-            routines_list.append({
+        image_url = self.coordinator.images.url
+        routines = sorted(daily_data.values(), key=lambda r: r["start_time"])
+
+        completed = sum(r["completed_count"] for r in routines)
+        total = sum(r["total_count"] for r in routines)
+        summary = {
+            ATTR_COMPLETED_TASKS: completed,
+            ATTR_TOTAL_TASKS: total,
+            ATTR_PROGRESS: _progress(completed, total),
+            ATTR_STALE: self.coordinator.stale,
+            "active_routines": [
+                routine["id"]
+                for routine in self.coordinator.data.get("active_routines", [])
+            ],
+        }
+
+        routines_list = [
+            {
                 "id": routine["id"],
                 "title": routine["title"],
                 "start_time": routine["start_time"].isoformat(),
@@ -64,74 +209,115 @@ class KidsScheduleDailySensor(CoordinatorEntity, SensorEntity):
                 "is_current": routine["is_current"],
                 "completed": routine["completed_count"],
                 "total": routine["total_count"],
-                "progress": (
-                    round((routine["completed_count"] / routine["total_count"]) * 100)
-                    if routine["total_count"] > 0
-                    else 0
+                "progress": _progress(
+                    routine["completed_count"], routine["total_count"]
                 ),
-                "tasks": routine["tasks"],
-            })
+            }
+            for routine in routines
+        ]
 
-        # Sort by start time
-        routines_list.sort(key=lambda r: r["start_time"])
+        if not self.compact_attributes:
+            attributes = {
+                **summary,
+                "routines": [
+                    {**summary_routine, ATTR_TASKS: task_dicts(routine, image_url)}
+                    for summary_routine, routine in zip(routines_list, routines)
+                ],
+                "current_routine": _routine_view(
+                    self.coordinator.data.get("current_routine"), image_url
+                ),
+                "next_routine": _routine_view(
+                    self.coordinator.data.get("next_routine"), image_url
+                ),
+            }
+            if self._within_budget(attributes):
+                return attributes
 
         return {
+            **summary,
+            "compact": True,
             "routines": routines_list,
-            "current_routine": self.coordinator.data.get("current_routine"),
-            "next_routine": self.coordinator.data.get("next_routine"),
+            "current_routine": _routine_summary(
+                self.coordinator.data.get("current_routine")
+            ),
+            "next_routine": _routine_summary(
+                self.coordinator.data.get("next_routine")
+            ),
         }
 
 
-class KidsScheduleWeeklySensor(CoordinatorEntity, SensorEntity):
+class KidsScheduleWeeklySensor(KidsScheduleSensor):
     """Sensor for weekly schedule."""
 
+    _unrecorded_attributes = frozenset({"weekly_schedule"})
+
     def __init__(
         self, coordinator: KidsScheduleCoordinator, config_entry: ConfigEntry
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._config_entry = config_entry
+        super().__init__(coordinator, config_entry)
         self._attr_name = f"{config_entry.title} Weekly"
         self._attr_unique_id = f"{config_entry.entry_id}_weekly"
         self._attr_icon = "mdi:calendar-week"
 
     @property
     def native_value(self) -> int:
-        """Return the total number of routines this week."""
+        """Return the total number of routines in the horizon."""
         weekly_data = self.coordinator.data.get("weekly", {})
         return sum(len(routines) for routines in weekly_data.values())
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
+    def _get_fingerprint(self) -> tuple[Any, ...]:
+        """Return the calendar fingerprint; the week has no live state."""
+        return (self.coordinator.events_fingerprint,)
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes."""
         weekly_data = self.coordinator.data.get("weekly", {})
-        
-        # Format for frontend
-        weekly_formatted = {}
-        for day, routines in weekly_data.items():
-            weekly_formatted[day] = [
-                {
-                    "id": r["id"],
-                    "title": r["title"],
-                    "start_time": r["start_time"].isoformat(),
-                    "end_time": r["end_time"].isoformat(),
-                    "task_count": r["task_count"],
-                }
-                for r in routines
-            ]
+        routines_per_day = {
+            day: len(routines) for day, routines in weekly_data.items()
+        }
+        horizon_days = self.coordinator.horizon_days
 
-        return {"weekly_schedule": weekly_formatted}
+        if not self.compact_attributes:
+            # Format for frontend
+            weekly_formatted = {}
+            for day, routines in weekly_data.items():
+                weekly_formatted[day] = [
+                    {
+                        "id": r["id"],
+                        "title": r["title"],
+                        "start_time": r["start_time"].isoformat(),
+                        "end_time": r["end_time"].isoformat(),
+                        "task_count": r["task_count"],
+                    }
+                    for r in routines
+                ]
+
+            attributes = {
+                "horizon_days": horizon_days,
+                "routines_per_day": routines_per_day,
+                "weekly_schedule": weekly_formatted,
+            }
+            if self._within_budget(attributes):
+                return attributes
+
+        return {
+            "horizon_days": horizon_days,
+            "routines_per_day": routines_per_day,
+            "compact": True,
+        }
 
 
-class KidsScheduleCurrentRoutineSensor(CoordinatorEntity, SensorEntity):
+class KidsScheduleCurrentRoutineSensor(KidsScheduleSensor):
     """Sensor for the current active routine."""
 
+    _unrecorded_attributes = frozenset({ATTR_TASKS})
+
     def __init__(
         self, coordinator: KidsScheduleCoordinator, config_entry: ConfigEntry
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._config_entry = config_entry
+        super().__init__(coordinator, config_entry)
         self._attr_name = f"{config_entry.title} Current Routine"
         self._attr_unique_id = f"{config_entry.entry_id}_current"
         self._attr_icon = "mdi:clock-outline"
@@ -144,61 +330,120 @@ class KidsScheduleCurrentRoutineSensor(CoordinatorEntity, SensorEntity):
             return current["title"]
         return "None"
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
+    def _get_fingerprint(self) -> tuple[Any, ...]:
+        """Return the calendar fingerprint plus current routine progress."""
         current = self.coordinator.data.get("current_routine")
-        
+        next_routine = self.coordinator.data.get("next_routine")
+        return (
+            self.coordinator.events_fingerprint,
+            self.coordinator.stale,
+            self.coordinator.images.version,
+            current and current["id"],
+            _completion(current),
+            next_routine and next_routine["id"],
+            tuple(
+                routine["id"]
+                for routine in self.coordinator.data.get("active_routines", [])
+            ),
+        )
+
+    def _build_attributes(self) -> dict[str, Any] | None:
+        """Build the state attributes."""
+        current = self.coordinator.data.get("current_routine")
+        stale = self.coordinator.stale
+
         if not current:
             next_routine = self.coordinator.data.get("next_routine")
             if next_routine:
                 return {
                     "status": "waiting",
+                    ATTR_STALE: stale,
                     "next_routine": next_routine["title"],
                     "next_start": next_routine["start_time"].isoformat(),
                 }
-            return {"status": "none"}
+            return {"status": "none", ATTR_STALE: stale}
 
-        return {
+        attributes = {
             "status": "active",
+            ATTR_STALE: stale,
             "id": current["id"],
             "title": current["title"],
             "start_time": current["start_time"].isoformat(),
             "end_time": current["end_time"].isoformat(),
             "completed": current["completed_count"],
             "total": current["total_count"],
-            "progress": (
-                round((current["completed_count"] / current["total_count"]) * 100)
-                if current["total_count"] > 0
-                else 0
-            ),
-            "tasks": current["tasks"],
-            "current_task": self._get_current_task(current),
+            "progress": _progress(current["completed_count"], current["total_count"]),
+            ATTR_CURRENT_TASK: self._get_current_task(current),
+            # Routines that overlap the current one, which comes first
+            "active_routines": [
+                _routine_summary(routine)
+                for routine in self.coordinator.data.get("active_routines", [])
+            ],
         }
 
+        if not self.compact_attributes:
+            full_attributes = {
+                **attributes,
+                ATTR_TASKS: task_dicts(current, self.coordinator.images.url),
+            }
+            if self._within_budget(full_attributes):
+                return full_attributes
+
+        return {**attributes, "compact": True}
+
     def _get_current_task(self, routine: dict[str, Any]) -> dict[str, Any] | None:
         """Get the current task to work on."""
-        require_order = self._config_entry.data.get("require_order", False)
-
-        if require_order:
-            # Return first incomplete task
-            for i, task in enumerate(routine["tasks"]):
-                if not task["completed"]:
-                    return {
-                        "index": i,
-                        "title": task["title"],
-                        "image": task.get("image"),
-                        "duration": task.get("duration", 5),
-                    }
-        else:
-            # Return any incomplete task (first one found)
-            for i, task in enumerate(routine["tasks"]):
-                if not task["completed"]:
-                    return {
-                        "index": i,
-                        "title": task["title"],
-                        "image": task.get("image"),
-                        "duration": task.get("duration", 5),
-                    }
+        # With or without require_order, the first incomplete task is next
+        index = first_incomplete(routine)
+        if index is None:
+            return None
 
-        return None
+        task = routine["tasks"][index]
+        return {
+            "index": index,
+            "title": task.title,
+            "image": task.image
+            and (self.coordinator.images.url(task.image) or task.image),
+            "duration": task.duration,
+        }
+
+
+class KidsScheduleDebugSensor(KidsScheduleSensor):
+    """Diagnostic sensor with the last refresh time and runtime metrics."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"counters", "timings", "fetcher"})
+
+    def __init__(
+        self, coordinator: KidsScheduleCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self._attr_name = f"{config_entry.title} Debug"
+        self._attr_unique_id = f"{config_entry.entry_id}_debug"
+        self._attr_icon = "mdi:speedometer"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh in milliseconds."""
+        return self.coordinator.metrics.last("refresh")
+
+    def _get_fingerprint(self) -> tuple[Any, ...]:
+        """Return the metrics version, which changes on every measurement."""
+        return (self.coordinator.metrics.version,)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the metrics; they change independently of the data."""
+        fetcher = self.coordinator.fetcher
+        return {
+            **self.coordinator.metrics.as_dict(),
+            "fetcher": {
+                "fetches": fetcher.fetches,
+                "coalesced": fetcher.coalesced,
+                "parse_cache": fetcher.task_cache.stats,
+            },
+        }
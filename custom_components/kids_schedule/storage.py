@@ -0,0 +1,85 @@
+"""Persistent storage for Kids Schedule."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+
+class KidsScheduleStore(Store[dict[str, Any]]):
+    """Store for completion state that migrates older layouts."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate stored data to the current version."""
+        if old_major_version < 2:
+            # Version 1 only kept the (never pruned) routine state
+            old_data = {
+                "routines": old_data.get("routines", {}),
+                "archive": {},
+            }
+        if old_major_version < 3:
+            # Version 2 kept a {"completed": bool} dict per task
+            old_data["routines"] = {
+                routine_id: _tasks_to_mask(routine_state)
+                for routine_id, routine_state in old_data["routines"].items()
+            }
+        return old_data
+
+
+def _tasks_to_mask(routine_state: dict[str, Any]) -> dict[str, Any]:
+    """Convert a version 2 routine state to a completion bitmask."""
+    tasks = routine_state.get("tasks", [])
+    new_state = {
+        key: value for key, value in routine_state.items() if key != "tasks"
+    }
+    new_state["mask"] = sum(
+        1 << index for index, task in enumerate(tasks) if task.get("completed")
+    )
+    new_state.setdefault("total", len(tasks))
+    return new_state
+
+
+def routine_day(routine_id: str) -> date | None:
+    """Return the local date a routine belongs to, from its ID."""
+    # Routine IDs start with the event's ISO start time
+    return dt_util.parse_date(routine_id[:10])
+
+
+def compact_state(
+    state: dict[str, dict[str, Any]],
+    archive: dict[str, dict[str, dict[str, int]]],
+    today: date,
+    retention_days: int,
+) -> bool:
+    """Archive completion state of past days and drop expired archive days.
+
+    Both dicts are changed in place. Returns True if anything changed.
+    """
+    changed = False
+
+    for routine_id in list(state):
+        day = routine_day(routine_id)
+        if day is None or day >= today:
+            continue
+
+        routine_state = state.pop(routine_id)
+        mask = routine_state.get("mask", 0)
+        archive.setdefault(day.isoformat(), {})[routine_id] = {
+            "completed": mask.bit_count(),
+            "total": routine_state.get("total", mask.bit_length()),
+        }
+        changed = True
+
+    cutoff = (today - timedelta(days=retention_days)).isoformat()
+    for day_key in [day_key for day_key in archive if day_key < cutoff]:
+        del archive[day_key]
+        changed = True
+
+    return changed
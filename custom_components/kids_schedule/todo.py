@@ -0,0 +1,161 @@
+"""Todo platform for Kids Schedule."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.todo import (
+    TodoItem,
+    TodoItemStatus,
+    TodoListEntity,
+    TodoListEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .coordinator import KidsScheduleCoordinator
+from .routine import is_completed
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up one todo list per routine from a config entry."""
+    coordinator: KidsScheduleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    known_titles: set[str] = set()
+
+    @callback
+    def _async_add_new_routines() -> None:
+        """Add a todo list for every routine title not seen before."""
+        new_titles = [
+            title
+            for title in dict.fromkeys(
+                routine["title"] for routine in coordinator.data["daily"].values()
+            )
+            if title not in known_titles
+        ]
+        if not new_titles:
+            return
+
+        known_titles.update(new_titles)
+        async_add_entities(
+            KidsScheduleRoutineTodoList(coordinator, config_entry, title)
+            for title in new_titles
+        )
+
+    _async_add_new_routines()
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(_async_add_new_routines)
+    )
+
+
+class KidsScheduleRoutineTodoList(CoordinatorEntity, TodoListEntity):
+    """Todo list with the tasks of one routine.
+
+    Lists are keyed by routine title so they stay stable from day to day;
+    the items always reflect today's occurrence of the routine.
+    """
+
+    _attr_supported_features = TodoListEntityFeature.UPDATE_TODO_ITEM
+
+    def __init__(
+        self,
+        coordinator: KidsScheduleCoordinator,
+        config_entry: ConfigEntry,
+        routine_title: str,
+    ) -> None:
+        """Initialize the todo list."""
+        super().__init__(coordinator)
+        self._config_entry = config_entry
+        self._routine_title = routine_title
+        self._attr_name = f"{config_entry.title} {routine_title}"
+        self._attr_unique_id = f"{config_entry.entry_id}_todo_{slugify(routine_title)}"
+        self._attr_icon = "mdi:format-list-checks"
+        self._attr_todo_items = self._build_items()
+        self._last_update_success = coordinator.last_update_success
+
+    def _get_routine(self) -> dict[str, Any] | None:
+        """Return today's routine with this title.
+
+        If the title occurs more than once today, the first one that has not
+        ended yet is used.
+        """
+        routines = sorted(
+            (
+                routine
+                for routine in self.coordinator.data["daily"].values()
+                if routine["title"] == self._routine_title
+            ),
+            key=lambda r: r["start_time"],
+        )
+        if not routines:
+            return None
+
+        now = dt_util.now()
+        for routine in routines:
+            if routine["end_time"] > now:
+                return routine
+        return routines[-1]
+
+    def _build_items(self) -> list[TodoItem]:
+        """Return the routine's tasks as todo items."""
+        routine = self._get_routine()
+        if routine is None:
+            return []
+
+        return [
+            TodoItem(
+                summary=task.title,
+                uid=str(index),
+                status=(
+                    TodoItemStatus.COMPLETED
+                    if is_completed(routine, index)
+                    else TodoItemStatus.NEEDS_ACTION
+                ),
+            )
+            for index, task in enumerate(routine["tasks"])
+        ]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this routine's items or availability changed."""
+        items = self._build_items()
+        if (
+            items == self._attr_todo_items
+            and self.coordinator.last_update_success == self._last_update_success
+        ):
+            return
+
+        self._attr_todo_items = items
+        self._last_update_success = self.coordinator.last_update_success
+        super()._handle_coordinator_update()
+
+    async def async_update_todo_item(self, item: TodoItem) -> None:
+        """Check or uncheck a task."""
+        routine = self._get_routine()
+        if routine is None:
+            raise HomeAssistantError(
+                f"{self._routine_title} is not scheduled today"
+            )
+        # Item UIDs are task indexes
+        if item.uid is None or not item.uid.isdecimal():
+            raise HomeAssistantError(f"Unknown todo item {item.uid!r}")
+
+        try:
+            await self.coordinator.async_set_tasks(
+                [
+                    (
+                        routine["id"],
+                        int(item.uid),
+                        item.status == TodoItemStatus.COMPLETED,
+                    )
+                ]
+            )
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
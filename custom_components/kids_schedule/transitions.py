@@ -0,0 +1,158 @@
+"""Routine start and end transitions for Kids Schedule."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import heapq
+import itertools
+from typing import Any, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+TRANSITION_START = "start"
+TRANSITION_END = "end"
+TRANSITION_DAY_END = "day_end"
+
+# Rebuild the heap once stale entries outnumber live ones by this factor
+_COMPACT_FACTOR = 2
+
+
+class Transition(NamedTuple):
+    """A routine starting or ending, or the end of the day."""
+
+    when: datetime
+    kind: str
+    routine_id: str | None
+
+
+class TransitionEngine:
+    """Fire a callback exactly at each upcoming routine transition.
+
+    Transitions live in a heap ordered by time and only one timer is armed,
+    for the earliest. Updates diff the routines against what is scheduled:
+    changed or removed routines leave stale heap entries behind that are
+    skipped when they surface, so an unchanged calendar costs nothing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[datetime, list[Transition]], None],
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._action = action
+        # Entries are (when, sequence, transition); the sequence breaks ties
+        self._heap: list[tuple[datetime, int, Transition]] = []
+        self._sequence = itertools.count()
+        # Routine ID -> (start, end) that the heap entries must match
+        self._scheduled: dict[str, tuple[datetime, datetime]] = {}
+        self._day_end: datetime | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_for: datetime | None = None
+
+    def __len__(self) -> int:
+        """Return the number of live transitions still to come."""
+        return sum(1 for entry in self._heap if self._is_live(entry[2]))
+
+    @callback
+    def async_update(
+        self, routines: dict[str, dict[str, Any]], day_end: datetime
+    ) -> None:
+        """Schedule the transitions of new or changed routines."""
+        now = dt_util.now()
+
+        for routine_id in self._scheduled.keys() - routines.keys():
+            del self._scheduled[routine_id]
+
+        for routine_id, routine in routines.items():
+            times = (routine["start_time"], routine["end_time"])
+            old_times = self._scheduled.get(routine_id)
+            if old_times == times:
+                continue
+            self._scheduled[routine_id] = times
+            for index, kind in enumerate((TRANSITION_START, TRANSITION_END)):
+                when = times[index]
+                # An unchanged time still has its live entry in the heap
+                if when > now and (old_times is None or old_times[index] != when):
+                    self._push(Transition(when, kind, routine_id))
+
+        if day_end != self._day_end:
+            self._day_end = day_end
+            self._push(Transition(day_end, TRANSITION_DAY_END, None))
+
+        if len(self._heap) > _COMPACT_FACTOR * max(len(self), 1):
+            self._heap = [entry for entry in self._heap if self._is_live(entry[2])]
+            heapq.heapify(self._heap)
+
+        self._async_arm()
+
+    def _push(self, transition: Transition) -> None:
+        """Add a transition to the heap."""
+        heapq.heappush(
+            self._heap, (transition.when, next(self._sequence), transition)
+        )
+
+    def _is_live(self, transition: Transition) -> bool:
+        """Return True if a heap entry still matches the schedule."""
+        if transition.kind == TRANSITION_DAY_END:
+            return transition.when == self._day_end
+        times = self._scheduled.get(transition.routine_id)
+        if times is None:
+            return False
+        index = 0 if transition.kind == TRANSITION_START else 1
+        return times[index] == transition.when
+
+    def _drop_stale(self) -> None:
+        """Pop stale entries off the top of the heap."""
+        while self._heap and not self._is_live(self._heap[0][2]):
+            heapq.heappop(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest transition, if not already armed."""
+        self._drop_stale()
+        when = self._heap[0][0] if self._heap else None
+        if when == self._armed_for:
+            return
+
+        self._async_cancel_timer()
+        if when is not None:
+            self._armed_for = when
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._async_handle_timer, when
+            )
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the armed timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_for = None
+
+    @callback
+    def _async_handle_timer(self, now: datetime) -> None:
+        """Run every transition that is due, then re-arm."""
+        self._unsub_timer = None
+        self._armed_for = None
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, transition = heapq.heappop(self._heap)
+            if self._is_live(transition):
+                due.append(transition)
+
+        if due:
+            self._action(now, due)
+        self._async_arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer and forget all transitions."""
+        self._async_cancel_timer()
+        self._heap.clear()
+        self._scheduled.clear()
+        self._day_end = None
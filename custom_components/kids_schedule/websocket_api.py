@@ -0,0 +1,280 @@
+"""WebSocket API for Kids Schedule."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, ATTR_ENTRY_ID, SIGNAL_ENTRY_UNLOADED
+from .coordinator import KidsScheduleCoordinator
+from .routine import task_dicts
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def _routine_message(
+    routine: dict[str, Any], image_url: Callable[[str], str | None]
+) -> dict[str, Any]:
+    """Return a routine as the card reads it."""
+    return {
+        "id": routine["id"],
+        "title": routine["title"],
+        "start_time": routine["start_time"].isoformat(),
+        "end_time": routine["end_time"].isoformat(),
+        "is_current": routine["is_current"],
+        "completed": routine["completed_count"],
+        "total": routine["total_count"],
+        "tasks": task_dicts(routine, image_url),
+    }
+
+
+def _weekly_message(data: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    """Return the per-day routine summaries of the horizon."""
+    return {
+        day: [
+            {
+                "id": routine["id"],
+                "title": routine["title"],
+                "start_time": routine["start_time"].isoformat(),
+                "end_time": routine["end_time"].isoformat(),
+                "task_count": routine["task_count"],
+            }
+            for routine in routines
+        ]
+        for day, routines in data.get("weekly", {}).items()
+    }
+
+
+def _routine_key(routine: dict[str, Any]) -> tuple[Any, ...]:
+    """Return everything about a routine but its completion."""
+    return (
+        routine["title"],
+        routine["start_time"],
+        routine["end_time"],
+        routine["is_current"],
+        routine["tasks"],
+    )
+
+
+def _selected_ids(
+    data: dict[str, Any]
+) -> tuple[str | None, str | None, tuple[str, ...]]:
+    """Return the IDs of the current, the next and all active routines."""
+    return (
+        (data.get("current_routine") or {}).get("id"),
+        (data.get("next_routine") or {}).get("id"),
+        tuple(routine["id"] for routine in data.get("active_routines", [])),
+    )
+
+
+class _Subscription:
+    """What one client was sent, and the deltas that bring it up to date.
+
+    Completion is compared as bitmasks, so a changed task costs one XOR.
+    """
+
+    def __init__(self, coordinator: KidsScheduleCoordinator) -> None:
+        """Initialize the subscription."""
+        self._coordinator = coordinator
+        self._generation = -1
+        self._fingerprint: str | None = None
+        self._image_version = -1
+        self._stale = False
+        # Routine ID -> (routine key, completion mask)
+        self._routines: dict[str, tuple[tuple[Any, ...], int]] = {}
+        self._selected: tuple[str | None, str | None, tuple[str, ...]] = (
+            None,
+            None,
+            (),
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the full state and remember it as sent."""
+        coordinator = self._coordinator
+        data = coordinator.data or {}
+        routines = sorted(
+            data.get("daily", {}).values(), key=lambda r: r["start_time"]
+        )
+        self._generation = coordinator.data_generation
+        self._fingerprint = coordinator.events_fingerprint
+        self._image_version = coordinator.images.version
+        self._routines = {
+            routine["id"]: (_routine_key(routine), routine["completed_mask"])
+            for routine in routines
+        }
+        self._selected = _selected_ids(data)
+        self._stale = coordinator.stale
+        return {
+            "type": "snapshot",
+            "stale": self._stale,
+            "daily": [
+                _routine_message(routine, coordinator.images.url)
+                for routine in routines
+            ],
+            "current_routine": self._selected[0],
+            "next_routine": self._selected[1],
+            "active_routines": list(self._selected[2]),
+            "weekly": _weekly_message(data),
+        }
+
+    def deltas(self) -> list[dict[str, Any]]:
+        """Return what changed since the last snapshot or deltas."""
+        coordinator = self._coordinator
+        if coordinator.data_generation == self._generation:
+            return []
+        self._generation = coordinator.data_generation
+        data = coordinator.data or {}
+        daily = data.get("daily", {})
+        changes: list[dict[str, Any]] = []
+
+        if coordinator.images.version != self._image_version:
+            # Image URLs are part of the routines, so send them all again
+            self._image_version = coordinator.images.version
+            self._routines.clear()
+
+        for routine_id in self._routines.keys() - daily.keys():
+            del self._routines[routine_id]
+            changes.append({"type": "routine_removed", "routine_id": routine_id})
+
+        for routine_id, routine in daily.items():
+            key = _routine_key(routine)
+            mask = routine["completed_mask"]
+            sent = self._routines.get(routine_id)
+            if sent == (key, mask):
+                continue
+            self._routines[routine_id] = (key, mask)
+
+            if sent is None or sent[0] != key:
+                changes.append(
+                    {
+                        "type": "routine",
+                        "routine": _routine_message(routine, coordinator.images.url),
+                    }
+                )
+                continue
+
+            flipped = sent[1] ^ mask
+            changes.append(
+                {
+                    "type": "tasks",
+                    "routine_id": routine_id,
+                    "completed": routine["completed_count"],
+                    "tasks": [
+                        [index, bool(mask >> index & 1)]
+                        for index in range(flipped.bit_length())
+                        if flipped >> index & 1
+                    ],
+                }
+            )
+
+        if (selected := _selected_ids(data)) != self._selected:
+            self._selected = selected
+            changes.append(
+                {
+                    "type": "selected",
+                    "current_routine": selected[0],
+                    "next_routine": selected[1],
+                    "active_routines": list(selected[2]),
+                }
+            )
+
+        if coordinator.stale != self._stale:
+            self._stale = coordinator.stale
+            changes.append({"type": "stale", "stale": self._stale})
+
+        if coordinator.events_fingerprint != self._fingerprint:
+            self._fingerprint = coordinator.events_fingerprint
+            changes.append({"type": "weekly", "weekly": _weekly_message(data)})
+
+        return changes
+
+
+def _resolve_coordinator(
+    hass: HomeAssistant, msg: dict[str, Any]
+) -> KidsScheduleCoordinator | None:
+    """Return the coordinator of the requested entry or entity."""
+    entry_id = msg.get(ATTR_ENTRY_ID)
+    if entry_id is None and (entity_id := msg.get(ATTR_ENTITY_ID)):
+        if entity_entry := er.async_get(hass).async_get(entity_id):
+            entry_id = entity_entry.config_entry_id
+    return hass.data.get(DOMAIN, {}).get(entry_id)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Exclusive(ATTR_ENTRY_ID, "target"): str,
+        vol.Exclusive(ATTR_ENTITY_ID, "target"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a snapshot of today's schedule, then deltas as it changes.
+
+    When the entry unloads the client gets an "unloaded" event and should
+    subscribe again once the entry is back.
+    """
+    coordinator = _resolve_coordinator(hass, msg)
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Kids Schedule entry not found"
+        )
+        return
+
+    subscription = _Subscription(coordinator)
+    msg_id = msg["id"]
+
+    @callback
+    def async_send_deltas() -> None:
+        """Send the changes of a coordinator update, if any."""
+        if changes := subscription.deltas():
+            coordinator.metrics.increment("websocket_deltas", len(changes))
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id, {"type": "deltas", "changes": changes}
+                )
+            )
+
+    unsub_listener = coordinator.async_add_listener(async_send_deltas)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop listening to the coordinator."""
+        unsub_listener()
+        unsub_unloaded()
+
+    @callback
+    def async_handle_unloaded() -> None:
+        """End the subscription when its entry unloads."""
+        connection.subscriptions.pop(msg_id, None)
+        async_unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"type": "unloaded"})
+        )
+
+    unsub_unloaded = async_dispatcher_connect(
+        hass,
+        SIGNAL_ENTRY_UNLOADED.format(coordinator.config_entry.entry_id),
+        async_handle_unloaded,
+    )
+    connection.subscriptions[msg_id] = async_unsubscribe
+
+    connection.send_result(msg_id)
+    connection.send_message(
+        websocket_api.event_message(msg_id, subscription.snapshot())
+    )
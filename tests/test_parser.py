@@ -0,0 +1,173 @@
+"""Tests for the Kids Schedule task description parser.
+
+The single-pass scanner stands in for the YAML parser on the documented
+formats, so every description here must parse exactly as _parse_yaml does.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import re
+
+import pytest
+import yaml
+
+from benchmarks.calendar_generator import FORMATS, make_description
+from custom_components.kids_schedule.parser import (
+    DEFAULT_TASK_DURATION,
+    TaskTemplate,
+    _parse_yaml,
+    parse_task_templates,
+)
+
+ROOT = Path(__file__).parent.parent
+DOCS = ("README.md", "QUICKSTART.md", "SAMPLE_EVENTS.md", "info.md")
+
+# Scalars YAML reads in different ways: strings, ints, nulls, other types
+# and values that are not valid in block context
+SCALARS = (
+    "Brush teeth",
+    "Read for 20 minutes",
+    "10",
+    "0",
+    "010",
+    "0x1F",
+    "+5",
+    "-1",
+    "1_000",
+    "5.5",
+    "2 min",
+    "yes",
+    "No",
+    "true",
+    "2024-01-01",
+    "~",
+    "null",
+    "",
+    "'7'",
+    "'It''s time'",
+    "'unterminated",
+    '"Read: 20 minutes"',
+    '"a\\tb"',
+    '"quoted" # comment',
+    '"quoted"#tight',
+    "x # comment",
+    "a#b",
+    "a: b",
+    "ends:",
+    "-",
+    "- nested",
+    "? key",
+    "[a, b]",
+    "&anchor value",
+    "*alias",
+    "| literal",
+    "%percent",
+    "/local/images/brush-teeth.png",
+)
+KEYS = ("title", "image", "duration", "other")
+
+
+def _expected(description: str) -> tuple[TaskTemplate, ...]:
+    """Return what the YAML parser makes of a description."""
+    try:
+        return _parse_yaml(description)
+    except yaml.YAMLError:
+        return ()
+
+
+def _doc_descriptions() -> list[str]:
+    """Return the YAML examples with tasks from the documentation."""
+    descriptions = []
+    for name in DOCS:
+        text = (ROOT / name).read_text()
+        for block in re.findall(r"```yaml\n(.*?)```", text, re.DOTALL):
+            if "tasks:" in block:
+                descriptions.append(block)
+    return descriptions
+
+
+def _random_description(rng: random.Random) -> str:
+    """Return a tasks list mixing scalar and mapping items."""
+    lines = ["# Morning", "tasks:"] if rng.random() < 0.2 else ["tasks:"]
+    indent = rng.choice(("", "  "))
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() < 0.3:
+            lines.append(f"{indent}- {rng.choice(SCALARS)}".rstrip())
+            continue
+        keys = rng.sample(KEYS, rng.randint(1, 3))
+        first, *rest = keys
+        if rng.random() < 0.1:
+            lines.append(f"{indent}-")
+            rest = keys
+        else:
+            lines.append(f"{indent}- {first}: {rng.choice(SCALARS)}".rstrip())
+        for key in rest:
+            lines.append(f"{indent}  {key}: {rng.choice(SCALARS)}".rstrip())
+        if rng.random() < 0.2:
+            lines.append(rng.choice(("", "  # note", "")))
+    if rng.random() < 0.1:
+        lines.append(f"name: {rng.choice(SCALARS)}".rstrip())
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("description", _doc_descriptions())
+def test_documented_examples(description: str) -> None:
+    """Test the examples in the documentation."""
+    assert parse_task_templates(description) == _expected(description)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_generated_descriptions(fmt: str) -> None:
+    """Test the benchmark's synthetic descriptions."""
+    rng = random.Random(0)
+    for variant in range(50):
+        description = make_description(fmt, rng.randint(0, 12), rng, variant)
+        if "tasks:" in description:
+            assert parse_task_templates(description) == _expected(description)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("10", 10),
+        ("010", 8),
+        ("'7'", "7"),
+        ("5.5", 5.5),
+        ("2 min", "2 min"),
+        ("", None),
+    ],
+)
+def test_duration(value: str, expected: object) -> None:
+    """Test that durations are read as YAML reads them."""
+    description = f"tasks:\n  - title: Brush teeth\n    duration: {value}"
+    assert parse_task_templates(description) == (
+        TaskTemplate("Brush teeth", None, expected),
+    )
+
+
+def test_scalar_items() -> None:
+    """Test that list items YAML reads as other types are skipped."""
+    description = "tasks:\n  - Brush teeth\n  - 10\n  - yes\n  -\n  - '10'"
+    assert parse_task_templates(description) == (
+        TaskTemplate("Brush teeth", None, DEFAULT_TASK_DURATION),
+        TaskTemplate("10", None, DEFAULT_TASK_DURATION),
+    )
+
+
+def test_random_descriptions() -> None:
+    """Test generated descriptions full of unusual scalars."""
+    rng = random.Random(0)
+    for _ in range(5000):
+        description = _random_description(rng)
+        assert parse_task_templates(description) == _expected(description), (
+            description
+        )
+
+
+def test_simple_list() -> None:
+    """Test the list format, which never goes through YAML."""
+    assert parse_task_templates("- Brush teeth\n2. Get dressed\nNotes") == (
+        TaskTemplate("Brush teeth", None, DEFAULT_TASK_DURATION),
+        TaskTemplate("Get dressed", None, DEFAULT_TASK_DURATION),
+    )
@@ -3,6 +3,11 @@
  * Custom Lovelace card for displaying child-friendly daily routines
  */
 
+// Seconds to wait before subscribing again after the entry went away
+const RESUBSCRIBE_DELAY = 5;
+// Thumbnails served by the integration: <digest>_<size>.<ext>
+const THUMBNAIL_URL = /^(\/api\/kids_schedule\/image\/[0-9a-f]{64})_\d+(\.[a-z]+)$/;
+
 class KidsScheduleCard extends HTMLElement {
   constructor() {
     super();
@@ -10,14 +15,29 @@ class KidsScheduleCard extends HTMLElement {
     this._config = {};
     this._hass = {};
     this._view = 'daily'; // daily, weekly, or routine
-    this._selectedRoutine = null;
+    this._selectedRoutineId = null;
     this._selectedDay = null;
+    // { routines, current, next, weekly }, kept up to date by the subscription
+    this._data = null;
+    this._unsub = null;
+    this._subscribing = false;
+    this._resubscribeTimer = null;
+    // Set when the integration has no WebSocket API; read sensor attributes
+    this._fallback = false;
+    this._lastStates = [];
+    // Static parts of the card, built once and patched afterwards
+    this._shell = null;
+    this.shadowRoot.addEventListener('click', (e) => this._handleClick(e));
   }
 
   setConfig(config) {
     if (!config.entity) {
       throw new Error('Please define an entity');
     }
+    if (config.entity !== this._config.entity) {
+      this._unsubscribe();
+      this._data = null;
+    }
     this._config = {
       entity: config.entity,
       title: config.title || 'My Schedule',
@@ -27,49 +47,351 @@ class KidsScheduleCard extends HTMLElement {
       theme: config.theme || 'default',
       ...config,
     };
+    // Options change the markup of every part
+    this._shell = null;
+    this._subscribe();
     this.render();
   }
 
   set hass(hass) {
+    // Called on every state change in Home Assistant; only our own data
+    // changing should re-render
     this._hass = hass;
-    this.render();
+    if (this._fallback) {
+      this._updateFromAttributes();
+    } else {
+      this._subscribe();
+    }
+  }
+
+  connectedCallback() {
+    this._subscribe();
+  }
+
+  disconnectedCallback() {
+    this._unsubscribe();
   }
 
   getCardSize() {
     return 6;
   }
 
+  async _subscribe() {
+    if (this._unsub || this._subscribing || this._fallback || !this.isConnected
+        || !this._hass.connection || !this._config.entity) {
+      return;
+    }
+
+    this._subscribing = true;
+    try {
+      const unsub = await this._hass.connection.subscribeMessage(
+        (message) => this._handleMessage(message),
+        { type: 'kids_schedule/subscribe', entity_id: this._config.entity },
+      );
+      if (this.isConnected) {
+        this._unsub = unsub;
+      } else {
+        unsub();
+      }
+    } catch (err) {
+      if (err && err.code === 'unknown_command') {
+        this._fallback = true;
+        this._updateFromAttributes();
+      } else {
+        // Entity not set up (yet), e.g. while the entry reloads
+        this._data = null;
+        this.render();
+        this._scheduleResubscribe();
+      }
+    } finally {
+      this._subscribing = false;
+    }
+  }
+
+  _unsubscribe() {
+    clearTimeout(this._resubscribeTimer);
+    this._resubscribeTimer = null;
+    if (this._unsub) {
+      this._unsub();
+      this._unsub = null;
+    }
+  }
+
+  _scheduleResubscribe() {
+    clearTimeout(this._resubscribeTimer);
+    this._resubscribeTimer = setTimeout(() => {
+      this._resubscribeTimer = null;
+      this._subscribe();
+    }, RESUBSCRIBE_DELAY * 1000);
+  }
+
+  _handleMessage(message) {
+    switch (message.type) {
+      case 'snapshot':
+        this._data = {
+          routines: message.daily,
+          current: message.current_routine,
+          next: message.next_routine,
+          weekly: message.weekly,
+          stale: message.stale,
+        };
+        break;
+      case 'deltas':
+        message.changes.forEach((change) => this._applyChange(change));
+        break;
+      case 'unloaded':
+        // The server ended the subscription; the entry is reloading
+        this._unsub = null;
+        this._scheduleResubscribe();
+        return;
+      default:
+        return;
+    }
+    this.render();
+  }
+
+  _applyChange(change) {
+    // Changed routines and tasks are replaced, never mutated
+    const data = this._data;
+    if (!data) return;
+
+    switch (change.type) {
+      case 'routine': {
+        const index = data.routines.findIndex((r) => r.id === change.routine.id);
+        if (index === -1) {
+          data.routines = [...data.routines, change.routine].sort(
+            (a, b) => new Date(a.start_time) - new Date(b.start_time),
+          );
+        } else {
+          data.routines = data.routines.map((r, i) => (i === index ? change.routine : r));
+        }
+        break;
+      }
+      case 'routine_removed':
+        data.routines = data.routines.filter((r) => r.id !== change.routine_id);
+        break;
+      case 'tasks':
+        data.routines = data.routines.map((routine) => {
+          if (routine.id !== change.routine_id) return routine;
+          const tasks = routine.tasks.slice();
+          change.tasks.forEach(([index, completed]) => {
+            tasks[index] = { ...tasks[index], completed };
+          });
+          return { ...routine, completed: change.completed, tasks };
+        });
+        break;
+      case 'selected':
+        data.current = change.current_routine;
+        data.next = change.next_routine;
+        break;
+      case 'weekly':
+        data.weekly = change.weekly;
+        break;
+      case 'stale':
+        data.stale = change.stale;
+        break;
+      default:
+        break;
+    }
+  }
+
+  _updateFromAttributes() {
+    const entity = this._hass.states[this._config.entity];
+    const weeklyEntity = this._hass.states[this._weeklyEntityId()];
+    // State objects are replaced when they change
+    if (entity === this._lastStates[0] && weeklyEntity === this._lastStates[1]) {
+      return;
+    }
+    this._lastStates = [entity, weeklyEntity];
+
+    this._data = entity ? {
+      routines: entity.attributes.routines || [],
+      current: entity.attributes.current_routine?.id,
+      next: entity.attributes.next_routine?.id,
+      weekly: weeklyEntity?.attributes.weekly_schedule || {},
+      stale: entity.attributes.stale,
+    } : null;
+    this.render();
+  }
+
+  _weeklyEntityId() {
+    return this._config.entity.replace('_daily', '_weekly');
+  }
+
+  _findRoutine(routineId) {
+    return this._data?.routines.find((r) => r.id === routineId) || null;
+  }
+
   render() {
     if (!this._config.entity) return;
 
-    const entity = this._hass.states[this._config.entity];
-    if (!entity) {
-      this.shadowRoot.innerHTML = '<ha-card>Entity not found</ha-card>';
+    if (!this._data) {
+      if (this._fallback || this._resubscribeTimer) {
+        this.shadowRoot.innerHTML = '<ha-card>Entity not found</ha-card>';
+        this._shell = null;
+      }
       return;
     }
 
-    const routines = entity.attributes.routines || [];
-    const currentRoutine = entity.attributes.current_routine;
-    const nextRoutine = entity.attributes.next_routine;
+    if (!this._shell) {
+      this._buildShell();
+    }
 
-    // Get weekly entity for weekly view
-    const weeklyEntityId = this._config.entity.replace('_daily', '_weekly');
-    const weeklyEntity = this._hass.states[weeklyEntityId];
-    const weeklySchedule = weeklyEntity?.attributes.weekly_schedule || {};
+    const shell = this._shell;
+    const headerKey = `${this._view}|${this.getTitle()}|${!!this._data.stale}`;
+    if (shell.headerKey !== headerKey) {
+      shell.header.innerHTML = this.renderHeader();
+      shell.headerKey = headerKey;
+    }
 
+    shell.daily.hidden = this._view !== 'daily';
+    shell.weekly.hidden = this._view !== 'weekly';
+    shell.routine.hidden = this._view !== 'routine';
+
+    // Hidden views are patched when they are opened
+    if (this._view === 'daily') this._patchDaily();
+    if (this._view === 'weekly') this._patchWeekly();
+    if (this._view === 'routine') this._patchRoutine();
+  }
+
+  _buildShell() {
     this.shadowRoot.innerHTML = `
       ${this.getStyles()}
       <ha-card>
         <div class="card-content">
-          ${this.renderHeader()}
-          ${this._view === 'daily' ? this.renderDailyView(routines, currentRoutine, nextRoutine) : ''}
-          ${this._view === 'weekly' ? this.renderWeeklyView(weeklySchedule) : ''}
-          ${this._view === 'routine' ? this.renderRoutineView(this._selectedRoutine) : ''}
+          <div class="header-slot"></div>
+          <div class="daily-view">
+            <div class="next-slot"></div>
+            <div class="empty-state" hidden>
+              <ha-icon icon="mdi:calendar-blank"></ha-icon>
+              <p>No routines scheduled for today</p>
+            </div>
+            <div class="routines-list"></div>
+          </div>
+          <div class="weekly-slot"></div>
+          <div class="routine-slot"></div>
         </div>
       </ha-card>
     `;
 
-    this.attachEventListeners();
+    const root = this.shadowRoot;
+    this._shell = {
+      header: root.querySelector('.header-slot'),
+      headerKey: null,
+      daily: root.querySelector('.daily-view'),
+      next: root.querySelector('.next-slot'),
+      empty: root.querySelector('.daily-view .empty-state'),
+      routines: root.querySelector('.routines-list'),
+      weekly: root.querySelector('.weekly-slot'),
+      routine: root.querySelector('.routine-slot'),
+    };
+    // What each part was last rendered from, compared by identity
+    this._routineNodes = new Map();
+    this._renderedNext = undefined;
+    this._renderedWeekly = null;
+    this._detail = null;
+  }
+
+  _element(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+  }
+
+  _patchDaily() {
+    const shell = this._shell;
+    const { routines } = this._data;
+    const currentRoutine = this._findRoutine(this._data.current);
+    const nextRoutine = this._findRoutine(this._data.next);
+
+    const next = nextRoutine && !currentRoutine ? nextRoutine : null;
+    if (next !== this._renderedNext) {
+      shell.next.innerHTML = next ? this.renderNextRoutine(next) : '';
+      this._renderedNext = next;
+    }
+    shell.empty.hidden = routines.length > 0;
+
+    // Keyed by routine ID; a routine object that did not change keeps its node
+    const seen = new Set();
+    let previous = null;
+    routines.forEach((routine) => {
+      let entry = this._routineNodes.get(routine.id);
+      if (!entry || entry.routine !== routine) {
+        const node = this._element(this.renderRoutineCard(routine));
+        if (entry) entry.node.replaceWith(node);
+        entry = { routine, node };
+        this._routineNodes.set(routine.id, entry);
+      }
+      seen.add(routine.id);
+
+      const expected = previous ? previous.nextSibling : shell.routines.firstChild;
+      if (expected !== entry.node) {
+        shell.routines.insertBefore(entry.node, expected);
+      }
+      previous = entry.node;
+    });
+
+    this._routineNodes.forEach((entry, routineId) => {
+      if (!seen.has(routineId)) {
+        entry.node.remove();
+        this._routineNodes.delete(routineId);
+      }
+    });
+  }
+
+  _patchWeekly() {
+    const { weekly } = this._data;
+    if (weekly !== this._renderedWeekly) {
+      this._shell.weekly.innerHTML = this.renderWeeklyView(weekly);
+      this._renderedWeekly = weekly;
+    }
+  }
+
+  _patchRoutine() {
+    const container = this._shell.routine;
+    const routine = this._findRoutine(this._selectedRoutineId);
+    const detail = this._detail;
+
+    if (!routine) {
+      container.innerHTML = '<div class="empty-state"><p>Routine not found</p></div>';
+      this._detail = null;
+      return;
+    }
+    if (detail && detail.routine === routine) return;
+
+    // Compact attributes carry no tasks
+    const tasks = routine.tasks || [];
+    if (!detail || detail.routine.id !== routine.id
+        || (detail.routine.tasks || []).length !== tasks.length) {
+      container.innerHTML = this.renderRoutineView(routine);
+      this._detail = {
+        routine,
+        taskNodes: Array.from(container.querySelectorAll('.task-card')),
+      };
+      return;
+    }
+
+    this._patchRoutineHeader(container, routine);
+    tasks.forEach((task, index) => {
+      if (task !== detail.routine.tasks[index]) {
+        const node = this._element(this.renderTaskCard(routine, task, index));
+        detail.taskNodes[index].replaceWith(node);
+        detail.taskNodes[index] = node;
+      }
+    });
+    detail.routine = routine;
+  }
+
+  _patchRoutineHeader(container, routine) {
+    // Updated in place so the progress ring animates
+    const progressPercent = (routine.completed / routine.total) * 100;
+    const fill = container.querySelector('.progress-ring-fill');
+    if (fill) {
+      fill.style.strokeDashoffset = 339.292 - (339.292 * progressPercent) / 100;
+      container.querySelector('.progress-number').textContent = routine.completed;
+      container.querySelector('.progress-total').textContent = `of ${routine.total}`;
+    }
+    container.querySelector('.complete-celebration').hidden = routine.completed !== routine.total;
   }
 
   renderHeader() {
@@ -85,18 +407,26 @@ class KidsScheduleCard extends HTMLElement {
       </button>
     ` : '';
 
+    // The calendar is unreachable and the last known schedule is shown
+    const staleBadge = this._data.stale ? `
+      <ha-icon class="stale-badge" icon="mdi:cloud-off-outline"
+               title="Calendar unavailable, showing the last known schedule"></ha-icon>
+    ` : '';
+
     return `
       <div class="header">
         ${backButton}
         <h2 class="title">${this.getTitle()}</h2>
+        ${staleBadge}
         ${viewToggle}
       </div>
     `;
   }
 
   getTitle() {
-    if (this._view === 'routine' && this._selectedRoutine) {
-      return this._selectedRoutine.title;
+    const routine = this._view === 'routine' && this._findRoutine(this._selectedRoutineId);
+    if (routine) {
+      return routine.title;
     }
     if (this._view === 'weekly') {
       return 'This Week';
@@ -104,65 +434,57 @@ class KidsScheduleCard extends HTMLElement {
     return this._config.title;
   }
 
-  renderDailyView(routines, currentRoutine, nextRoutine) {
-    if (!routines || routines.length === 0) {
-      return `
-        <div class="empty-state">
-          <ha-icon icon="mdi:calendar-blank"></ha-icon>
-          <p>No routines scheduled for today</p>
-        </div>
-      `;
-    }
-
-    const routineCards = routines.map(routine => {
-      const isCurrent = routine.is_current;
-      const isComplete = routine.completed === routine.total;
-      const progressPercent = (routine.completed / routine.total) * 100;
+  renderRoutineCard(routine) {
+    const isCurrent = routine.is_current;
+    const isComplete = routine.completed === routine.total;
+    const progressPercent = (routine.completed / routine.total) * 100;
+    const tasks = routine.tasks || [];
 
-      return `
-        <div class="routine-card ${isCurrent ? 'current' : ''} ${isComplete ? 'complete' : ''}" 
-             data-routine-id="${routine.id}">
-          <div class="routine-header">
-            <div class="routine-info">
-              <h3 class="routine-title">${routine.title}</h3>
-              ${this._config.show_time ? `
-                <span class="routine-time">
-                  ${this.formatTime(routine.start_time)} - ${this.formatTime(routine.end_time)}
-                </span>
-              ` : ''}
-            </div>
-            ${isCurrent ? '<span class="badge current-badge">Now</span>' : ''}
-            ${isComplete ? '<span class="badge complete-badge">Done!</span>' : ''}
+    return `
+      <div class="routine-card ${isCurrent ? 'current' : ''} ${isComplete ? 'complete' : ''}" 
+           data-routine-id="${routine.id}">
+        <div class="routine-header">
+          <div class="routine-info">
+            <h3 class="routine-title">${routine.title}</h3>
+            ${this._config.show_time ? `
+              <span class="routine-time">
+                ${this.formatTime(routine.start_time)} - ${this.formatTime(routine.end_time)}
+              </span>
+            ` : ''}
           </div>
-          
-          ${this._config.show_progress ? `
-            <div class="progress-bar">
-              <div class="progress-fill" style="width: ${progressPercent}%"></div>
+          ${isCurrent ? '<span class="badge current-badge">Now</span>' : ''}
+          ${isComplete ? '<span class="badge complete-badge">Done!</span>' : ''}
+        </div>
+        
+        ${this._config.show_progress ? `
+          <div class="progress-bar">
+            <div class="progress-fill" style="width: ${progressPercent}%"></div>
+          </div>
+          <div class="progress-text">${routine.completed} of ${routine.total} tasks</div>
+        ` : ''}
+
+        <div class="task-preview">
+          ${tasks.slice(0, 3).map((task) => `
+            <div class="task-preview-item ${task.completed ? 'completed' : ''}">
+              <ha-icon icon="${task.completed ? 'mdi:check-circle' : 'mdi:circle-outline'}"></ha-icon>
+              <span>${task.title}</span>
             </div>
-            <div class="progress-text">${routine.completed} of ${routine.total} tasks</div>
+          `).join('')}
+          ${tasks.length > 3 ? `
+            <div class="task-preview-more">+${tasks.length - 3} more</div>
           ` : ''}
-
-          <div class="task-preview">
-            ${routine.tasks.slice(0, 3).map((task, index) => `
-              <div class="task-preview-item ${task.completed ? 'completed' : ''}">
-                <ha-icon icon="${task.completed ? 'mdi:check-circle' : 'mdi:circle-outline'}"></ha-icon>
-                <span>${task.title}</span>
-              </div>
-            `).join('')}
-            ${routine.tasks.length > 3 ? `
-              <div class="task-preview-more">+${routine.tasks.length - 3} more</div>
-            ` : ''}
-          </div>
-
-          <button class="open-routine-btn" data-routine-id="${routine.id}">
-            <span>Open Routine</span>
-            <ha-icon icon="mdi:chevron-right"></ha-icon>
-          </button>
         </div>
-      `;
-    }).join('');
 
-    const nextRoutineCard = nextRoutine && !currentRoutine ? `
+        <button class="open-routine-btn" data-routine-id="${routine.id}">
+          <span>Open Routine</span>
+          <ha-icon icon="mdi:chevron-right"></ha-icon>
+        </button>
+      </div>
+    `;
+  }
+
+  renderNextRoutine(nextRoutine) {
+    return `
       <div class="next-routine-card">
         <ha-icon icon="mdi:clock-outline"></ha-icon>
         <div>
@@ -171,13 +493,6 @@ class KidsScheduleCard extends HTMLElement {
           <p class="next-time">Starts at ${this.formatTime(nextRoutine.start_time)}</p>
         </div>
       </div>
-    ` : '';
-
-    return `
-      ${nextRoutineCard}
-      <div class="routines-list">
-        ${routineCards}
-      </div>
     `;
   }
 
@@ -226,12 +541,9 @@ class KidsScheduleCard extends HTMLElement {
   }
 
   renderRoutineView(routine) {
-    if (!routine) {
-      return '<div class="empty-state"><p>Routine not found</p></div>';
-    }
-
     const progressPercent = (routine.completed / routine.total) * 100;
     const isComplete = routine.completed === routine.total;
+    const tasks = routine.tasks || [];
 
     return `
       <div class="routine-detail-view">
@@ -250,45 +562,15 @@ class KidsScheduleCard extends HTMLElement {
             </div>
           ` : ''}
           
-          ${isComplete ? `
-            <div class="complete-celebration">
-              <ha-icon icon="mdi:trophy"></ha-icon>
-              <h3>All Done!</h3>
-              <p>Great job completing this routine!</p>
-            </div>
-          ` : ''}
+          <div class="complete-celebration" ${isComplete ? '' : 'hidden'}>
+            <ha-icon icon="mdi:trophy"></ha-icon>
+            <h3>All Done!</h3>
+            <p>Great job completing this routine!</p>
+          </div>
         </div>
 
         <div class="tasks-list">
-          ${routine.tasks.map((task, index) => `
-            <div class="task-card ${task.completed ? 'completed' : ''}" 
-                 data-task-index="${index}" data-routine-id="${routine.id}">
-              <div class="task-checkbox">
-                <button class="checkbox-btn" 
-                        data-action="toggle-task" 
-                        data-routine-id="${routine.id}" 
-                        data-task-index="${index}">
-                  <ha-icon icon="${task.completed ? 'mdi:checkbox-marked-circle' : 'mdi:checkbox-blank-circle-outline'}"></ha-icon>
-                </button>
-              </div>
-              
-              ${this._config.show_images && task.image ? `
-                <div class="task-image">
-                  <img src="${task.image}" alt="${task.title}" />
-                </div>
-              ` : ''}
-              
-              <div class="task-content">
-                <h4 class="task-title">${task.title}</h4>
-                ${task.duration ? `
-                  <span class="task-duration">
-                    <ha-icon icon="mdi:clock-outline"></ha-icon>
-                    ${task.duration} min
-                  </span>
-                ` : ''}
-              </div>
-            </div>
-          `).join('')}
+          ${tasks.map((task, index) => this.renderTaskCard(routine, task, index)).join('')}
         </div>
 
         <div class="routine-actions">
@@ -301,6 +583,47 @@ class KidsScheduleCard extends HTMLElement {
     `;
   }
 
+  imageSrcset(image) {
+    // Let high-density screens pick a larger thumbnail
+    const match = THUMBNAIL_URL.exec(image);
+    if (!match) return '';
+    const [, base, ext] = match;
+    return `srcset="${base}_128${ext} 0.5x, ${base}_256${ext} 1x, ${base}_512${ext} 2x"`;
+  }
+
+  renderTaskCard(routine, task, index) {
+    return `
+      <div class="task-card ${task.completed ? 'completed' : ''}" 
+           data-task-index="${index}" data-routine-id="${routine.id}">
+        <div class="task-checkbox">
+          <button class="checkbox-btn" 
+                  data-action="toggle-task" 
+                  data-routine-id="${routine.id}" 
+                  data-task-index="${index}">
+            <ha-icon icon="${task.completed ? 'mdi:checkbox-marked-circle' : 'mdi:checkbox-blank-circle-outline'}"></ha-icon>
+          </button>
+        </div>
+        
+        ${this._config.show_images && task.image ? `
+          <div class="task-image">
+            <img src="${task.image}" ${this.imageSrcset(task.image)}
+                 alt="${task.title}" loading="lazy" decoding="async" />
+          </div>
+        ` : ''}
+        
+        <div class="task-content">
+          <h4 class="task-title">${task.title}</h4>
+          ${task.duration ? `
+            <span class="task-duration">
+              <ha-icon icon="mdi:clock-outline"></ha-icon>
+              ${task.duration} min
+            </span>
+          ` : ''}
+        </div>
+      </div>
+    `;
+  }
+
   formatTime(isoString) {
     const date = new Date(isoString);
     return date.toLocaleTimeString('en-US', { 
@@ -310,87 +633,52 @@ class KidsScheduleCard extends HTMLElement {
     });
   }
 
-  attachEventListeners() {
-    // Back button
-    this.shadowRoot.querySelectorAll('[data-action="back"]').forEach(btn => {
-      btn.addEventListener('click', () => {
+  async _handleClick(e) {
+    // One listener for the whole card, so patched nodes need no re-binding
+    const target = e.target.closest('[data-action], .routine-card');
+    if (!target) return;
+
+    switch (target.dataset.action) {
+      case 'back':
         this._view = this._selectedDay ? 'weekly' : 'daily';
-        this._selectedRoutine = null;
+        this._selectedRoutineId = null;
         this._selectedDay = null;
         this.render();
-      });
-    });
+        break;
 
-    // Toggle weekly view
-    this.shadowRoot.querySelectorAll('[data-action="toggle-weekly"]').forEach(btn => {
-      btn.addEventListener('click', () => {
+      case 'toggle-weekly':
         this._view = 'weekly';
         this.render();
-      });
-    });
-
-    // Open routine from daily view
-    this.shadowRoot.querySelectorAll('.open-routine-btn, .routine-card').forEach(card => {
-      card.addEventListener('click', (e) => {
-        if (e.target.closest('[data-action="toggle-task"]')) return;
-        
-        const routineId = card.dataset.routineId || card.closest('[data-routine-id]').dataset.routineId;
-        const entity = this._hass.states[this._config.entity];
-        const routine = entity.attributes.routines.find(r => r.id === routineId);
-        
-        if (routine) {
-          this._selectedRoutine = routine;
-          this._view = 'routine';
-          this.render();
-        }
-      });
-    });
+        break;
 
-    // Toggle task
-    this.shadowRoot.querySelectorAll('[data-action="toggle-task"]').forEach(btn => {
-      btn.addEventListener('click', async (e) => {
-        e.stopPropagation();
-        const routineId = btn.dataset.routineId;
-        const taskIndex = parseInt(btn.dataset.taskIndex);
-        
-        const entity = this._hass.states[this._config.entity];
-        const routine = entity.attributes.routines.find(r => r.id === routineId);
-        const task = routine.tasks[taskIndex];
-        
+      case 'toggle-task': {
+        const routineId = target.dataset.routineId;
+        const taskIndex = parseInt(target.dataset.taskIndex);
+        const task = this._findRoutine(routineId).tasks[taskIndex];
         const service = task.completed ? 'uncheck_task' : 'check_task';
-        
+
+        // The change comes back as a delta and patches the task's node
         await this._hass.callService('kids_schedule', service, {
           routine_id: routineId,
           task_index: taskIndex,
         });
+        break;
+      }
 
-        // Wait a bit for state update then refresh
-        setTimeout(() => {
-          const updatedEntity = this._hass.states[this._config.entity];
-          const updatedRoutine = updatedEntity.attributes.routines.find(r => r.id === routineId);
-          this._selectedRoutine = updatedRoutine;
-          this.render();
-        }, 500);
-      });
-    });
-
-    // Reset routine
-    this.shadowRoot.querySelectorAll('[data-action="reset-routine"]').forEach(btn => {
-      btn.addEventListener('click', async () => {
-        const routineId = btn.dataset.routineId;
-        
+      case 'reset-routine':
         await this._hass.callService('kids_schedule', 'reset_routine', {
-          routine_id: routineId,
+          routine_id: target.dataset.routineId,
         });
+        break;
 
-        setTimeout(() => {
-          const entity = this._hass.states[this._config.entity];
-          const routine = entity.attributes.routines.find(r => r.id === routineId);
-          this._selectedRoutine = routine;
+      default:
+        // Open routine from daily view
+        if (this._findRoutine(target.dataset.routineId)) {
+          this._selectedRoutineId = target.dataset.routineId;
+          this._view = 'routine';
           this.render();
-        }, 500);
-      });
-    });
+        }
+    }
   }
 
   getStyles() {
@@ -406,6 +694,10 @@ class KidsScheduleCard extends HTMLElement {
           --warning-color: #ff9800;
         }
 
+        [hidden] {
+          display: none !important;
+        }
+
         ha-card {
           padding: 16px;
           overflow: hidden;
@@ -430,6 +722,10 @@ class KidsScheduleCard extends HTMLElement {
           color: var(--text-primary);
         }
 
+        .stale-badge {
+          color: var(--warning-color, #ffa600);
+        }
+
         .back-button, .view-toggle {
           background: var(--divider-color);
           border: none;